@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import site
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pandas as pd
+from stock_data_indicators import compute_indicators
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """Describes a float64 frame whose values live in a shared memory block.
+
+    Only this description is pickled to the workers; the values are mapped.
+    """
+
+    name: str
+    index: pd.Index
+    columns: pd.MultiIndex
+
+    def attach(self) -> tuple[SharedMemory, np.ndarray]:
+        """Map the block as a 2D array, without copying it."""
+        shm = SharedMemory(name=self.name)
+        values = np.ndarray(
+            (len(self.index), len(self.columns)), dtype="float64", buffer=shm.buf
+        )
+        return shm, values
+
+
+def allocate_shared_frame(
+    index: pd.Index, columns: pd.MultiIndex
+) -> tuple[SharedMemory, SharedFrame]:
+    """Create a shared block big enough for a float64 frame of this shape."""
+    size = max(1, len(index) * len(columns) * 8)
+    shm = SharedMemory(create=True, size=size)
+    return shm, SharedFrame(shm.name, index, columns)
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """One pool per size for the life of the process, so workers stay warm."""
+    if max_workers not in _pools:
+        # spawn, because forking a process that runs Prefect's threads can deadlock
+        context = multiprocessing.get_context("spawn")
+        # Workers unpickle _compute_chunk by module name, so they need this
+        # folder on sys.path even when the flow was loaded from an entrypoint
+        _pools[max_workers] = ProcessPoolExecutor(
+            max_workers,
+            mp_context=context,
+            initializer=site.addsitedir,
+            initargs=(os.path.dirname(os.path.abspath(__file__)),),
+        )
+    return _pools[max_workers]
+
+
+def _compute_chunk(
+    raw: SharedFrame,
+    out: SharedFrame,
+    start: int,
+    stop: int,
+    indicators: dict[str, list[int]] | None,
+):
+    """Worker: compute the indicators for tickers start:stop and write them in place."""
+    raw_shm, raw_values = raw.attach()
+    out_shm, out_values = out.attach()
+    try:
+        tickers = out.columns.levels[1][out.columns.codes[1][start:stop]]
+        in_chunk = raw.columns.get_level_values(1).isin(tickers)
+        df_chunk = pd.DataFrame(
+            raw_values[:, in_chunk], raw.index, raw.columns[in_chunk], copy=False
+        )
+        df_result = compute_indicators(df_chunk, indicators)
+        # The output is laid out indicator by indicator, each with every ticker
+        n_names = len(out.columns.levels[0])
+        n_tickers = len(out.columns) // n_names
+        computed = df_result.iloc[:, df_chunk.shape[1] :].to_numpy()
+        out_values.reshape(len(out.index), n_names, n_tickers)[:, :, start:stop] = (
+            computed.reshape(len(out.index), n_names, stop - start)
+        )
+        # The arrays must be released before the blocks can be closed
+        del raw_values, out_values
+    finally:
+        raw_shm.close()
+        out_shm.close()
+
+
+def compute_indicators_parallel(
+    df: pd.DataFrame,
+    indicators: dict[str, list[int]] | None = None,
+    max_workers: int | None = None,
+    chunks_per_worker: int = 4,
+) -> pd.DataFrame:
+    """compute_indicators, split by ticker across a pool of worker processes.
+
+    The raw values are copied once into shared memory and every worker maps
+    them; each worker writes its tickers' indicators straight into a shared
+    output block, so no DataFrame is pickled in either direction.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    tickers = list(df["Close"].columns)
+    # Run one row through the serial code to learn the output columns
+    first_ticker = df.columns.get_level_values(1) == tickers[0]
+    probe = compute_indicators(df.iloc[:1, first_ticker], indicators)
+    raw_names = set(df.columns.get_level_values(0))
+    names = [
+        name
+        for name in probe.columns.get_level_values(0).unique()
+        if name not in raw_names
+    ]
+    out_columns = pd.MultiIndex.from_product([names, tickers], names=df.columns.names)
+
+    raw_shm, raw = allocate_shared_frame(df.index, df.columns)
+    out_shm, out = allocate_shared_frame(df.index, out_columns)
+    try:
+        raw_values = np.ndarray(df.shape, dtype="float64", buffer=raw_shm.buf)
+        raw_values[:] = df.to_numpy(dtype="float64")
+        del raw_values
+        n_chunks = min(len(tickers), max_workers * chunks_per_worker)
+        pool = get_process_pool(max_workers)
+        bounds = np.linspace(0, len(tickers), n_chunks + 1).astype(int)
+        try:
+            futures = [
+                pool.submit(_compute_chunk, raw, out, start, stop, indicators)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            wait(futures)
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next call starts a new one
+            _pools.pop(max_workers, None)
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        out_values = np.ndarray(
+            (len(df), len(out_columns)), dtype="float64", buffer=out_shm.buf
+        )
+        df_indicators = pd.DataFrame(out_values.copy(), df.index, out_columns)
+        del out_values
+    finally:
+        raw_shm.close()
+        raw_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+    return pd.concat([df, df_indicators], axis=1)
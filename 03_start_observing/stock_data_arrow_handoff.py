@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+import pandas as pd
+import pyarrow as pa
+import yfinance as yf
+from prefect import flow, task
+from prefect.runtime import flow_run
+
+HANDOFF_DIR = "./data/handoff"
+
+
+def run_handoff_dir(flow_run_id: str | None = None) -> str:
+    """The handoff directory of a flow run, by default the current one."""
+    return os.path.join(HANDOFF_DIR, str(flow_run_id or flow_run.id or "no-flow-run"))
+
+
+def remove_run_handoff_dir(flow, flow_run, state):
+    """on_completion hook: the run's ArrowFrameRef results are not needed any more.
+
+    Only a Completed run is cleaned up. A flow retry reuses the persisted
+    results of the tasks that already succeeded, so the files they point to
+    must outlive a failed attempt; a run that ends Failed keeps them.
+    """
+    shutil.rmtree(run_handoff_dir(flow_run.id), ignore_errors=True)
+
+
+@dataclass(frozen=True)
+class ArrowFrameRef:
+    """A pointer to a DataFrame saved as an uncompressed Arrow IPC (Feather) file.
+
+    Tasks return this instead of the DataFrame, so Prefect only pickles and
+    persists a path. Readers memory-map the file, so loading does not copy the
+    column data into the process.
+    """
+
+    path: str
+    rows: int
+
+    def load(self) -> pd.DataFrame:
+        """Memory-map the file and wrap its columns in a DataFrame without copying."""
+        with pa.memory_map(self.path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        layout = json.loads(table.schema.metadata[b"frame_layout"])
+
+        # split_blocks keeps each column as its own view on the mapped buffers
+        df = table.to_pandas(split_blocks=True, self_destruct=False)
+        df = df.set_index("__index__")
+        df.index.name = layout["index_name"]
+        if layout["column_names"] is not None:
+            df.columns = pd.MultiIndex.from_tuples(
+                [tuple(column) for column in layout["columns"]],
+                names=layout["column_names"],
+            )
+        else:
+            df.columns = layout["columns"]
+        return df
+
+
+def write_arrow_frame(df: pd.DataFrame, directory: str | None = None) -> ArrowFrameRef:
+    """Write a DataFrame to an Arrow IPC file and return a reference to it."""
+    directory = directory or run_handoff_dir()
+    os.makedirs(directory, exist_ok=True)
+    is_multi_index = isinstance(df.columns, pd.MultiIndex)
+    layout = {
+        "columns": [list(c) if is_multi_index else c for c in df.columns],
+        "column_names": list(df.columns.names) if is_multi_index else None,
+        "index_name": df.index.name,
+    }
+    # Keep NaN as a float value rather than an Arrow null, so numeric columns
+    # can be handed back to pandas without filling a validity mask
+    arrays = [pa.array(df.index.to_numpy())]
+    arrays += [pa.array(df.iloc[:, i].to_numpy()) for i in range(df.shape[1])]
+    names = ["__index__"] + [str(i) for i in range(df.shape[1])]
+    table = pa.Table.from_arrays(arrays, names=names).replace_schema_metadata(
+        {"frame_layout": json.dumps(layout)}
+    )
+
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.arrow")
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return ArrowFrameRef(path=path, rows=len(df))
+
+
+@task
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> ArrowFrameRef:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return write_arrow_frame(df)
+
+
+@task
+def save_raw_stock_data(df_ref: ArrowFrameRef, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df_ref.load().to_csv(f"./data/{filename}")
+
+
+@task
+def transform_stock_data(df_ref: ArrowFrameRef) -> ArrowFrameRef:
+    """Compute the moving average of the close price for the previous 3 days."""
+    df = df_ref.load()
+    stock_name = df.columns.get_level_values(1)[0]
+    df[("Moving Average Close", stock_name)] = df["Close"].rolling(window=3).mean()
+    return write_arrow_frame(df)
+
+
+@task
+def save_transformed_stock_data(df_ref: ArrowFrameRef, filename: str):
+    """Write the transformed stock data to a CSV file."""
+    df_ref.load().to_csv(f"./data/{filename}")
+
+
+@flow(persist_result=True, on_completion=[remove_run_handoff_dir])
+def fetch_and_save_stock_data(
+    ticker: str = "AAPL",
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+):
+    """Main ETL workflow to fetch and save stock data."""
+    df_raw = fetch_stock_data(ticker, start_date, end_date, period)
+    save_raw_stock_data(df_raw, f"{ticker}_stock_data.csv")
+    df_transformed = transform_stock_data(df_raw)
+    save_transformed_stock_data(df_transformed, f"{ticker}_transformed_stock_data.csv")
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
@@ -0,0 +1,99 @@
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task, unmapped
+
+
+def chunk_tickers(tickers: list[str], chunk_size: int) -> list[list[str]]:
+    """Split the tickers into chunks of at most chunk_size symbols."""
+    return [tickers[i : i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+
+def split_by_ticker(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Split a multi-ticker download into one DataFrame per ticker."""
+    frames = {}
+    for ticker in df.columns.get_level_values(1).unique():
+        df_ticker = df.xs(ticker, axis=1, level=1, drop_level=False)
+        # A batched download aligns every ticker on the union of dates
+        frames[ticker] = df_ticker.dropna(how="all")
+    return frames
+
+
+@task
+def fetch_stock_data(
+    tickers: list[str], start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data for several tickers from Yahoo Finance in one call."""
+    df = yf.download(
+        tickers,
+        start=start_date,
+        end=end_date,
+        period=period,
+        group_by="column",
+        progress=False,
+    )
+    return df
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@task
+def transform_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the moving average of the close price for the previous 3 days."""
+    # df["Close"] has one column per ticker, so this works for one or many tickers
+    moving_average = df["Close"].rolling(window=3).mean()
+    moving_average.columns = pd.MultiIndex.from_product(
+        [["Moving Average Close"], moving_average.columns],
+        names=df.columns.names,
+    )
+    return pd.concat([df, moving_average], axis=1)
+
+
+@task
+def save_transformed_stock_data(df: pd.DataFrame, filename: str):
+    """Write the transformed stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@flow
+def fetch_and_save_stock_data(
+    tickers: list[str] | None = None,
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+    chunk_size: int = 200,
+):
+    """Fetch many tickers in a few batched downloads, then fan out per ticker."""
+    if tickers is None:
+        tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "SNOW"]
+
+    raw_chunks = fetch_stock_data.map(
+        chunk_tickers(tickers, chunk_size),
+        unmapped(start_date),
+        unmapped(end_date),
+        unmapped(period),
+    )
+
+    frames = {}
+    for df_chunk in raw_chunks.result():
+        frames.update(split_by_ticker(df_chunk))
+    symbols = list(frames)
+    dfs_raw = list(frames.values())
+
+    saved_raw = save_raw_stock_data.map(
+        dfs_raw, [f"{ticker}_stock_data.csv" for ticker in symbols]
+    )
+    dfs_transformed = transform_stock_data.map(dfs_raw)
+    saved_transformed = save_transformed_stock_data.map(
+        dfs_transformed,
+        [f"{ticker}_transformed_stock_data.csv" for ticker in symbols],
+    )
+    saved_raw.wait()
+    saved_transformed.wait()
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
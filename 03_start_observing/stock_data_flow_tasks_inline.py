@@ -0,0 +1,75 @@
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task
+
+
+@task
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return df
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@task
+def transform_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the moving average of the close price for the previous 3 days."""
+    stock_name = df.columns.get_level_values(1)[0]
+    df[("Moving Average Close", stock_name)] = df["Close"].rolling(window=3).mean()
+    return df
+
+
+@task
+def save_transformed_stock_data(df: pd.DataFrame, filename: str):
+    """Write the transformed stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@task
+def fetch_and_save_raw_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data and save it, with the save running inline in this task."""
+    df = fetch_stock_data.fn(ticker, start_date, end_date, period)
+    save_raw_stock_data.fn(df, f"{ticker}_stock_data.csv")
+    return df
+
+
+@task
+def transform_and_save_stock_data(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Transform the stock data and save it, with the save running inline in this task."""
+    df = transform_stock_data.fn(df)
+    save_transformed_stock_data.fn(df, f"{ticker}_transformed_stock_data.csv")
+    return df
+
+
+@flow
+def fetch_and_save_stock_data(
+    ticker: str = "AAPL",
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+    inline_saves: bool = True,
+):
+    """Main ETL workflow, with the cheap save steps optionally folded into their parents."""
+    if inline_saves:
+        # Two task runs instead of four: the saves get no task run of their own
+        df_raw = fetch_and_save_raw_stock_data(ticker, start_date, end_date, period)
+        transform_and_save_stock_data(df_raw, ticker)
+        return
+
+    df_raw = fetch_stock_data(ticker, start_date, end_date, period)
+    save_raw_stock_data(df_raw, f"{ticker}_stock_data.csv")
+    df_transformed = transform_stock_data(df_raw)
+    save_transformed_stock_data(df_transformed, f"{ticker}_transformed_stock_data.csv")
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
@@ -0,0 +1,59 @@
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task
+from task_profiling import profiled, publish_task_profiles
+
+# Run with PROFILE_TASKS=1 to collect the profile table, e.g.
+#   PROFILE_TASKS=1 python 03_start_observing/stock_data_flow_tasks_profiled.py
+
+
+@task
+@profiled(top_n=5)
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return df
+
+
+@task
+@profiled
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@task
+@profiled
+def transform_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the moving average of the close price for the previous 3 days."""
+    stock_name = df.columns.get_level_values(1)[0]
+    df[("Moving Average Close", stock_name)] = df["Close"].rolling(window=3).mean()
+    return df
+
+
+@task
+@profiled
+def save_transformed_stock_data(df: pd.DataFrame, filename: str):
+    """Write the transformed stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@flow
+def fetch_and_save_stock_data(
+    ticker: str = "AAPL",
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+):
+    """Main ETL workflow to fetch and save stock data."""
+    df_raw = fetch_stock_data(ticker, start_date, end_date, period)
+    save_raw_stock_data(df_raw, f"{ticker}_stock_data.csv")
+    df_transformed = transform_stock_data(df_raw)
+    save_transformed_stock_data(df_transformed, f"{ticker}_transformed_stock_data.csv")
+    publish_task_profiles()
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
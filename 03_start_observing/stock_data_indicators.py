@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task
+
+# Indicator name -> list of windows, computed for every ticker in the frame
+DEFAULT_INDICATORS = {
+    "sma": [3, 10, 20, 50],
+    "ema": [12, 26],
+    "volatility": [20],
+    "vwap": [20],
+    "returns": [1, 5],
+}
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum down the rows of a 2D array, NaN unless the window is complete."""
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    total = np.concatenate([zeros, np.cumsum(filled, axis=0)])
+    count = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+    window_total = total[window:] - total[:-window]
+    window_count = count[window:] - count[:-window]
+
+    result = np.full(values.shape, np.nan)
+    result[window - 1 :] = np.where(window_count == window, window_total, np.nan)
+    return result
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift the rows of a 2D array down, filling the top with NaN."""
+    result = np.full(values.shape, np.nan)
+    result[periods:] = values[:-periods]
+    return result
+
+
+def compute_indicators(
+    df: pd.DataFrame, indicators: dict[str, list[int]] | None = None
+) -> pd.DataFrame:
+    """Compute every configured indicator for all tickers in one pass over wide blocks."""
+    if indicators is None:
+        indicators = DEFAULT_INDICATORS
+
+    tickers = df["Close"].columns
+    close = df["Close"].to_numpy(dtype="float64")
+    results = {}
+
+    for window in indicators.get("sma", []):
+        results[f"SMA {window} Close"] = rolling_sum(close, window) / window
+
+    for window in indicators.get("ema", []):
+        ema = df["Close"].ewm(span=window, adjust=False).mean()
+        results[f"EMA {window} Close"] = ema.to_numpy()
+
+    if indicators.get("volatility"):
+        daily_returns = close / shift(close, 1) - 1
+        for window in indicators["volatility"]:
+            total = rolling_sum(daily_returns, window)
+            total_squares = rolling_sum(daily_returns**2, window)
+            variance = (total_squares - total**2 / window) / (window - 1)
+            results[f"Volatility {window}"] = np.sqrt(np.clip(variance, 0, None))
+
+    if indicators.get("vwap"):
+        volume = df["Volume"].to_numpy(dtype="float64")
+        high = df["High"].to_numpy(dtype="float64")
+        low = df["Low"].to_numpy(dtype="float64")
+        typical_price = (high + low + close) / 3
+        for window in indicators["vwap"]:
+            results[f"VWAP {window}"] = rolling_sum(
+                typical_price * volume, window
+            ) / rolling_sum(volume, window)
+
+    for periods in indicators.get("returns", []):
+        results[f"Return {periods}"] = close / shift(close, periods) - 1
+
+    # Build the output in a single concat so the frame is not fragmented
+    blocks = [
+        pd.DataFrame(
+            values,
+            index=df.index,
+            columns=pd.MultiIndex.from_product(
+                [[name], tickers], names=df.columns.names
+            ),
+        )
+        for name, values in results.items()
+    ]
+    return pd.concat([df, *blocks], axis=1)
+
+
+@task
+def fetch_stock_data(
+    tickers: list[str], start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data for several tickers from Yahoo Finance in one call."""
+    df = yf.download(tickers, start=start_date, end=end_date, period=period)
+    return df
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@task
+def transform_stock_data(
+    df: pd.DataFrame, indicators: dict[str, list[int]] | None = None
+) -> pd.DataFrame:
+    """Compute the configured indicators for every ticker at once."""
+    return compute_indicators(df, indicators)
+
+
+@task
+def save_transformed_stock_data(df: pd.DataFrame, filename: str):
+    """Write the transformed stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@flow
+def fetch_and_save_stock_data(
+    tickers: list[str] | None = None,
+    start_date: str = "2024-01-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+    indicators: dict[str, list[int]] | None = None,
+):
+    """Fetch several tickers and compute a set of indicators for all of them."""
+    if tickers is None:
+        tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "SNOW"]
+
+    df_raw = fetch_stock_data(tickers, start_date, end_date, period)
+    save_raw_stock_data(df_raw, "stock_data.csv")
+    df_transformed = transform_stock_data(df_raw, indicators)
+    save_transformed_stock_data(df_transformed, "transformed_stock_data.csv")
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
@@ -0,0 +1,41 @@
+import pandas as pd
+from prefect import flow, task
+from parallel_indicators import compute_indicators_parallel
+from stock_data_indicators import (
+    fetch_stock_data,
+    save_raw_stock_data,
+    save_transformed_stock_data,
+)
+
+
+@task
+def transform_stock_data(
+    df: pd.DataFrame,
+    indicators: dict[str, list[int]] | None = None,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """Compute the configured indicators for every ticker on all CPU cores."""
+    return compute_indicators_parallel(df, indicators, max_workers)
+
+
+@flow
+def fetch_and_save_stock_data(
+    tickers: list[str] | None = None,
+    start_date: str = "2024-01-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+    indicators: dict[str, list[int]] | None = None,
+    max_workers: int | None = None,
+):
+    """Fetch several tickers and compute their indicators in worker processes."""
+    if tickers is None:
+        tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "SNOW"]
+
+    df_raw = fetch_stock_data(tickers, start_date, end_date, period)
+    save_raw_stock_data(df_raw, "stock_data.csv")
+    df_transformed = transform_stock_data(df_raw, indicators, max_workers)
+    save_transformed_stock_data(df_transformed, "transformed_stock_data.csv")
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
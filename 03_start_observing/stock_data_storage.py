@@ -0,0 +1,253 @@
+import os
+from abc import ABC, abstractmethod
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import yfinance as yf
+from prefect import flow, task
+
+
+def to_long_format(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn the (Price, Ticker) column MultiIndex into one row per date and ticker."""
+    df_long = df.stack(level=1, future_stack=True).reset_index()
+    df_long.columns = ["Date", "Ticker", *df_long.columns[2:]]
+    df_long.columns.name = None
+    return df_long.dropna(subset=["Close"])
+
+
+def to_wide_format(df_long: pd.DataFrame) -> pd.DataFrame:
+    """Turn long rows back into the (Price, Ticker) layout returned by yfinance."""
+    df = df_long.pivot(index="Date", columns="Ticker")
+    df.columns.names = ["Price", "Ticker"]
+    return df.sort_index()
+
+
+class StockDataStorage(ABC):
+    """Base class for the places a flow can save and load stock data."""
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame, dataset: str):
+        """Save a (Price, Ticker) frame as the named dataset."""
+
+    @abstractmethod
+    def read(
+        self,
+        dataset: str,
+        tickers: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Load the dataset back as a (Price, Ticker) frame, filtered as given."""
+
+
+class ArrowDatasetStorage(StockDataStorage):
+    """Store stock data as a Parquet or Arrow IPC dataset partitioned by ticker and year."""
+
+    def __init__(
+        self,
+        base_dir: str = "./data",
+        file_format: str = "parquet",
+        compression: str = "zstd",
+    ):
+        self.base_dir = base_dir
+        self.file_format = file_format
+        self.compression = compression
+        self.partitioning = ds.partitioning(
+            pa.schema([("Ticker", pa.string()), ("year", pa.int32())]), flavor="hive"
+        )
+
+    def _path(self, dataset: str) -> str:
+        return os.path.join(self.base_dir, f"{dataset}_{self.file_format}")
+
+    def _file_options(self):
+        if self.file_format == "parquet":
+            return ds.ParquetFileFormat().make_write_options(
+                compression=self.compression
+            )
+        return ds.IpcFileFormat().make_write_options(compression=self.compression)
+
+    def write(self, df: pd.DataFrame, dataset: str):
+        """Write the data, merging it into the ticker/year partitions it covers.
+
+        A partition is rewritten as a whole, so the rows already in it are read
+        back and kept unless the new data has the same date and ticker.
+        """
+        df_long = to_long_format(df)
+        df_long["year"] = df_long["Date"].dt.year.astype("int32")
+        partitions = df_long[["Ticker", "year"]].drop_duplicates()
+        if os.path.exists(self._path(dataset)):
+            existing = (
+                ds.dataset(
+                    self._path(dataset),
+                    format="parquet" if self.file_format == "parquet" else "ipc",
+                    partitioning=self.partitioning,
+                )
+                .to_table(
+                    filter=ds.field("Ticker").isin(partitions["Ticker"].unique())
+                    & ds.field("year").isin(partitions["year"].unique())
+                )
+                .to_pandas()
+                .merge(partitions)
+            )
+            df_long = (
+                pd.concat([existing, df_long])
+                .drop_duplicates(["Date", "Ticker"], keep="last")
+                .sort_values(["Ticker", "Date"])
+            )
+        table = pa.Table.from_pandas(df_long, preserve_index=False)
+        ds.write_dataset(
+            table,
+            self._path(dataset),
+            format="parquet" if self.file_format == "parquet" else "ipc",
+            partitioning=self.partitioning,
+            file_options=self._file_options(),
+            basename_template="part-{i}." + self.file_format,
+            existing_data_behavior="delete_matching",
+        )
+
+    def read(
+        self,
+        dataset: str,
+        tickers: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Read the data, pushing the ticker and date filters down to the files."""
+        arrow_dataset = ds.dataset(
+            self._path(dataset),
+            format="parquet" if self.file_format == "parquet" else "ipc",
+            partitioning=self.partitioning,
+        )
+        # The ticker and year predicates prune whole partitions, and the Date
+        # predicate skips Parquet row groups using their min/max statistics
+        predicate = None
+        conditions = []
+        if tickers:
+            conditions.append(ds.field("Ticker").isin(tickers))
+        if start_date:
+            start = pd.Timestamp(start_date)
+            conditions.append(ds.field("year") >= start.year)
+            conditions.append(ds.field("Date") >= start)
+        if end_date:
+            end = pd.Timestamp(end_date)
+            conditions.append(ds.field("year") <= end.year)
+            conditions.append(ds.field("Date") < end)
+        for condition in conditions:
+            predicate = condition if predicate is None else predicate & condition
+
+        if columns is not None:
+            columns = ["Date", "Ticker", *columns]
+        table = arrow_dataset.to_table(filter=predicate, columns=columns)
+        df_long = table.to_pandas().drop(columns=["year"], errors="ignore")
+        return to_wide_format(df_long)
+
+
+class CsvStorage(StockDataStorage):
+    """Legacy export: one CSV per ticker with the three-row (Price, Ticker, Date) header."""
+
+    def __init__(self, base_dir: str = "./data"):
+        self.base_dir = base_dir
+
+    def _path(self, dataset: str, ticker: str) -> str:
+        suffix = "stock_data" if dataset == "raw" else f"{dataset}_stock_data"
+        return os.path.join(self.base_dir, f"{ticker}_{suffix}.csv")
+
+    def write(self, df: pd.DataFrame, dataset: str):
+        for ticker in df.columns.get_level_values(1).unique():
+            df_ticker = df.xs(ticker, axis=1, level=1, drop_level=False)
+            df_ticker.dropna(how="all").to_csv(self._path(dataset, ticker))
+
+    def read(
+        self,
+        dataset: str,
+        tickers: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        if not tickers:
+            raise ValueError("CSV storage can only read an explicit list of tickers")
+        df = pd.concat(
+            [
+                pd.read_csv(
+                    self._path(dataset, ticker),
+                    header=[0, 1],
+                    index_col=0,
+                    parse_dates=True,
+                )
+                for ticker in tickers
+            ],
+            axis=1,
+        ).sort_index(axis=1)
+        if start_date is not None:
+            df = df[df.index >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df.index < pd.Timestamp(end_date)]
+        if columns is not None:
+            df = df[columns]
+        return df
+
+
+def get_storage(storage_format: str, base_dir: str = "./data") -> StockDataStorage:
+    """Return the storage backend for "parquet", "arrow" or "csv"."""
+    if storage_format == "csv":
+        return CsvStorage(base_dir)
+    if storage_format in ("parquet", "arrow"):
+        return ArrowDatasetStorage(base_dir, file_format=storage_format)
+    raise ValueError(f"Unknown storage format: {storage_format}")
+
+
+@task
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return df
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, storage_format: str):
+    """Save the raw stock data to the configured storage."""
+    get_storage(storage_format).write(df, "raw")
+
+
+@task
+def transform_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the moving average of the close price for the previous 3 days."""
+    # Work on a copy, so the raw frame can still be exported unchanged
+    df = df.copy()
+    stock_name = df.columns.get_level_values(1)[0]
+    df[("Moving Average Close", stock_name)] = df["Close"].rolling(window=3).mean()
+    return df
+
+
+@task
+def save_transformed_stock_data(df: pd.DataFrame, storage_format: str):
+    """Write the transformed stock data to the configured storage."""
+    get_storage(storage_format).write(df, "transformed")
+
+
+@flow
+def fetch_and_save_stock_data(
+    ticker: str = "AAPL",
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+    storage_format: str = "parquet",
+    export_csv: bool = False,
+):
+    """Main ETL workflow to fetch and save stock data."""
+    df_raw = fetch_stock_data(ticker, start_date, end_date, period)
+    save_raw_stock_data(df_raw, storage_format)
+    df_transformed = transform_stock_data(df_raw)
+    save_transformed_stock_data(df_transformed, storage_format)
+    if export_csv and storage_format != "csv":
+        save_raw_stock_data(df_raw, "csv")
+        save_transformed_stock_data(df_transformed, "csv")
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from contextlib import closing, contextmanager
+from datetime import date, timedelta
+import pandas as pd
+import yfinance as yf
+
+
+class FetchCache:
+    """On-disk cache for market-data downloads with a TTL for recent dates and LRU eviction.
+
+    Ranges that ended more than settled_days ago will not change any more, so
+    they never expire. Ranges touching recent dates expire after ttl_seconds.
+    When the cache grows past max_bytes the least recently used entries are
+    removed. Entries live in cache_dir as pickles, indexed by a SQLite file so
+    concurrent task runs and flow runs can share the cache safely.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/fetch_cache",
+        max_bytes: int = 500 * 1024 * 1024,
+        ttl_seconds: int = 3600,
+        settled_days: int = 3,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.settled_days = settled_days
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, "
+                "size INTEGER, accessed_at REAL, expires_at REAL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the index and commit the changes made in the block as one transaction."""
+        path = os.path.join(self.cache_dir, "index.sqlite")
+        with closing(sqlite3.connect(path, timeout=30)) as db:
+            with db:
+                yield db
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _count(self, db: sqlite3.Connection, name: str, amount: int = 1):
+        db.execute(
+            "INSERT INTO stats VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    @staticmethod
+    def make_key(ticker: str, start_date: str, end_date: str, period: str) -> str:
+        return hashlib.sha256(
+            f"{ticker}|{start_date}|{end_date}|{period}".encode()
+        ).hexdigest()
+
+    def get(
+        self, ticker: str, start_date: str, end_date: str, period: str = "1d"
+    ) -> pd.DataFrame | None:
+        """Return the cached download, or None on a miss or an expired entry."""
+        key = self.make_key(ticker, start_date, end_date, period)
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            expired = row is not None and row[0] is not None and row[0] < time.time()
+            if row is None or expired or not os.path.exists(self._path(key)):
+                self._count(db, "misses")
+                return None
+            db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._count(db, "hits")
+        return pd.read_pickle(self._path(key))
+
+    def put(
+        self,
+        df: pd.DataFrame,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        period: str = "1d",
+    ):
+        """Store a download and evict least recently used entries over the size cap."""
+        key = self.make_key(ticker, start_date, end_date, period)
+        path = self._path(key)
+        df.to_pickle(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+        settled = date.today() - timedelta(days=self.settled_days)
+        is_settled = date.fromisoformat(end_date) <= settled
+        expires_at = None if is_settled else time.time() + self.ttl_seconds
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, os.path.getsize(path), time.time(), expires_at),
+            )
+            self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+            total -= size
+            self._count(db, "evictions")
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit, miss and eviction counters plus the current size."""
+        with self._connect() as db:
+            counters = dict(db.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+def month_chunks(start_date: str, end_date: str) -> list[tuple[str, str]]:
+    """Split [start_date, end_date) into calendar-month ranges."""
+    boundaries = pd.date_range(start_date, end_date, freq="MS").strftime("%Y-%m-%d")
+    edges = sorted({start_date, *boundaries, end_date})
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def cached_download(
+    cache: FetchCache,
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    period: str = "1d",
+    download: Callable[..., pd.DataFrame] | None = None,
+) -> pd.DataFrame:
+    """Download month by month through the cache, so a retry only fetches what is missing."""
+    if download is None:
+        download = yf.download
+    dfs = []
+    for chunk_start, chunk_end in month_chunks(start_date, end_date):
+        df = cache.get(ticker, chunk_start, chunk_end, period)
+        if df is None:
+            df = download(ticker, start=chunk_start, end=chunk_end, period=period)
+            # yf.download returns an empty or all-NaN frame instead of raising
+            # on a failed request, so such a frame must not be cached for good
+            if not df.empty and not df.isna().all().all():
+                cache.put(df, ticker, chunk_start, chunk_end, period)
+        dfs.append(df)
+    return pd.concat(dfs)
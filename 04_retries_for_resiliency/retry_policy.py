@@ -0,0 +1,143 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import httpx
+from prefect.exceptions import MissingContextError
+from prefect.logging import get_run_logger
+
+# Status codes worth retrying; anything else (401, 404, ...) will not get better
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Errors other than httpx ones that a retry can fix; a KeyError or TypeError cannot
+RETRYABLE_EXCEPTIONS = (ConnectionError, TimeoutError)
+
+
+def get_logger() -> logging.Logger | logging.LoggerAdapter:
+    """Log to the task run when there is one, so backoffs show in the UI."""
+    try:
+        return get_run_logger()
+    except MissingContextError:
+        return logging.getLogger(__name__)
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Return the Retry-After header in seconds, whether given as seconds or a date."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostBackoff:
+    """One backoff clock per host, shared by every task run in the process.
+
+    When a host throttles us, the clock is pushed back and the waiting task runs
+    are released one at a time, spacing seconds apart, instead of all retrying
+    at the same moment.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        spacing: float = 0.25,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.spacing = spacing
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+        self._last_delay: dict[str, float] = {}
+
+    def wait(self, host: str):
+        """Block until this host may be called again, taking the next free slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            if host in self._last_delay:
+                # Still backing off: hand out staggered slots
+                self._next_slot[host] = slot + self.spacing
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record_success(self, host: str):
+        """Reset the backoff after a request to the host went through."""
+        with self._lock:
+            self._last_delay.pop(host, None)
+
+    def record_failure(self, host: str, retry_after: float | None = None) -> float:
+        """Push the host's clock back and return the delay that was applied.
+
+        Uses Retry-After when the server sent one, otherwise decorrelated
+        jitter: a random delay between base_delay and three times the last one.
+        """
+        with self._lock:
+            last_delay = self._last_delay.get(host, self.base_delay)
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                delay = min(
+                    self.max_delay, random.uniform(self.base_delay, last_delay * 3)
+                )
+            self._last_delay[host] = max(delay, self.base_delay)
+            now = time.monotonic()
+            self._next_slot[host] = max(self._next_slot.get(host, now), now + delay)
+        return delay
+
+
+class RateLimitRetryPolicy:
+    """A retry_condition_fn that classifies HTTP errors and backs off per host.
+
+    Use it with retry_delay_seconds=0: the delay is applied by the shared
+    HostBackoff clock, which the task waits on before each request. Besides
+    the retryable status codes and httpx transport errors, only the
+    retryable_exceptions are retried; any other error fails the task at once.
+    """
+
+    def __init__(
+        self,
+        backoff: HostBackoff,
+        retryable_status_codes=None,
+        retryable_exceptions=RETRYABLE_EXCEPTIONS,
+    ):
+        self.backoff = backoff
+        self.retryable_status_codes = retryable_status_codes or RETRYABLE_STATUS_CODES
+        self.retryable_exceptions = retryable_exceptions
+
+    def __call__(self, task, task_run, state) -> bool:
+        try:
+            state.result()
+        except httpx.HTTPStatusError as exc:
+            status_code = exc.response.status_code
+            if status_code not in self.retryable_status_codes:
+                return False
+            delay = self.backoff.record_failure(
+                exc.request.url.host, parse_retry_after(exc.response)
+            )
+            get_logger().warning(
+                f"HTTP {status_code} from {exc.request.url.host}, backing off {delay:.1f}s"
+            )
+            return True
+        except httpx.TransportError as exc:
+            # Timeouts and dropped connections: back off without a server hint
+            try:
+                host = exc.request.url.host
+            except RuntimeError:
+                return True  # the error was raised without a request attached
+            delay = self.backoff.record_failure(host)
+            get_logger().warning(f"{exc!r} from {host}, backing off {delay:.1f}s")
+            return True
+        except self.retryable_exceptions:
+            return True
+        except Exception:
+            return False
+        return False
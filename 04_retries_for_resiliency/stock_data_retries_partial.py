@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task
+from prefect.runtime import flow_run, task_run
+from fetch_cache import month_chunks
+
+CHECKPOINT_DIR = "./data/checkpoints"
+FETCH_RETRIES = 2
+
+
+class PartialFetchError(Exception):
+    """Some ticker/date chunks failed; the retry will only request those."""
+
+
+def flaky_download(tickers: list[str], start: str, end: str, period: str):
+    """Download from Yahoo Finance, failing some of the time."""
+    if random.random() < 0.3:
+        print("Simulating an intermittent API failure")
+        raise Exception("This is an error simulating an intermittent API failure")
+    return yf.download(tickers, start=start, end=end, period=period, progress=False)
+
+
+def checkpoint_dir(tickers: list[str], start_date: str, end_date: str, period: str):
+    """One checkpoint folder per flow run and batch, so retries of the run resume it.
+
+    fetch_stock_data removes the folder once it has put the frame together,
+    so checkpoints only take disk space while a fetch is being retried.
+    """
+    batch = json.dumps([sorted(tickers), start_date, end_date, period])
+    batch_id = hashlib.sha256(f"{flow_run.id}|{batch}".encode()).hexdigest()[:16]
+    return os.path.join(CHECKPOINT_DIR, batch_id)
+
+
+def unit_path(directory: str, ticker: str, start: str, end: str) -> str:
+    """Where one ticker's data for one month is checkpointed."""
+    return os.path.join(directory, f"{ticker}_{start}_{end}.pkl")
+
+
+@task(retries=FETCH_RETRIES, retry_delay_seconds=2)
+def fetch_stock_data(
+    tickers: list[str], start_date: str, end_date: str, period: str = "1d"
+) -> tuple[pd.DataFrame, dict]:
+    """Fetch every ticker and month, checkpointing each one that succeeds.
+
+    A retry only requests the ticker/month pairs that are not checkpointed
+    yet. A month without rows, such as one holding only market holidays, is
+    checkpointed as done, and a ticker without rows in any month is reported
+    as having no data rather than retried. On the last attempt the failed
+    requests are reported instead of raised.
+    """
+    directory = checkpoint_dir(tickers, start_date, end_date, period)
+    os.makedirs(directory, exist_ok=True)
+    chunks = month_chunks(start_date, end_date)
+
+    failed = {}
+    for start, end in chunks:
+        pending = [
+            ticker
+            for ticker in tickers
+            if not os.path.exists(unit_path(directory, ticker, start, end))
+        ]
+        if not pending:
+            continue
+        try:
+            df = flaky_download(pending, start, end, period)
+        except Exception as exc:
+            for ticker in pending:
+                failed.setdefault(ticker, []).append(f"{start}..{end}: {exc}")
+            continue
+
+        for ticker in pending:
+            if ticker in df.columns.get_level_values(1):
+                df_ticker = df.xs(ticker, axis=1, level=1, drop_level=False)
+                df_ticker = df_ticker.dropna(how="all")
+            else:
+                df_ticker = df.iloc[:0, :0]
+            # An empty month is a result too, so a retry does not request it again
+            df_ticker.to_pickle(unit_path(directory, ticker, start, end))
+
+    if failed and task_run.run_count <= FETCH_RETRIES:
+        raise PartialFetchError(
+            f"{len(failed)} of {len(tickers)} tickers have failed chunks: {sorted(failed)}"
+        )
+
+    dfs = []
+    for ticker in tickers:
+        paths = [unit_path(directory, ticker, start, end) for start, end in chunks]
+        parts = [pd.read_pickle(path) for path in paths if os.path.exists(path)]
+        parts = [part for part in parts if not part.empty]
+        if parts:
+            dfs.append(pd.concat(parts))
+        elif ticker not in failed:
+            # yfinance reports unknown or delisted symbols as empty columns
+            failed[ticker] = [f"{start_date}..{end_date}: no data"]
+    shutil.rmtree(directory, ignore_errors=True)
+
+    df_raw = pd.concat(dfs, axis=1) if dfs else None
+    fetched = (
+        {ticker for ticker in df_raw.columns.get_level_values(1)} if dfs else set()
+    )
+    summary = {
+        "succeeded": [ticker for ticker in tickers if ticker not in failed],
+        "partial": [ticker for ticker in failed if ticker in fetched],
+        "failed": failed,
+    }
+    return df_raw, summary
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@flow(log_prints=True)
+def fetch_and_save_stock_data(
+    tickers: list[str] | None = None,
+    start_date: str = "2024-10-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+):
+    """Fetch a batch of tickers, keeping whatever succeeded when some fail."""
+    if tickers is None:
+        tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "SNOW", "NOT-A-TICKER"]
+
+    df_raw, summary = fetch_stock_data(tickers, start_date, end_date, period)
+    for ticker in summary["succeeded"] + summary["partial"]:
+        df_ticker = df_raw.xs(ticker, axis=1, level=1, drop_level=False)
+        save_raw_stock_data(df_ticker.dropna(how="all"), f"{ticker}_stock_data.csv")
+
+    print(
+        f"Fetched {len(summary['succeeded'])} of {len(tickers)} tickers in full, "
+        f"{len(summary['partial'])} in part"
+    )
+    for ticker, errors in summary["failed"].items():
+        print(f"  {ticker} failed for {len(errors)} range(s): {errors[0]}")
+    return summary
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
@@ -0,0 +1,68 @@
+import random
+import httpx
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task, unmapped
+from retry_policy import HostBackoff, RateLimitRetryPolicy
+
+YAHOO_HOST = "query1.finance.yahoo.com"
+
+# One clock for every task run in this process that calls Yahoo Finance
+yahoo_backoff = HostBackoff(base_delay=1, max_delay=30, spacing=0.25)
+
+
+def simulate_rate_limit(ticker: str):
+    """Raise a 429 with a Retry-After header some of the time."""
+    if random.random() < 0.3:
+        raise httpx.HTTPStatusError(
+            message="Simulated 429 Too Many Requests",
+            request=httpx.Request(
+                "GET", f"https://{YAHOO_HOST}/v8/finance/chart/{ticker}"
+            ),
+            response=httpx.Response(status_code=429, headers={"Retry-After": "2"}),
+        )
+
+
+@task(
+    retries=5,
+    retry_delay_seconds=0,
+    retry_condition_fn=RateLimitRetryPolicy(yahoo_backoff),
+)
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance, waiting on the shared backoff clock."""
+    yahoo_backoff.wait(YAHOO_HOST)
+    simulate_rate_limit(ticker)
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    yahoo_backoff.record_success(YAHOO_HOST)
+    return df
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@flow(log_prints=True)
+def fetch_and_save_stock_data(
+    tickers: list[str] | None = None,
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+):
+    """Fetch many tickers concurrently without stampeding a throttling API."""
+    if tickers is None:
+        tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "SNOW", "NVDA", "META", "NFLX"]
+
+    dfs_raw = fetch_stock_data.map(
+        tickers, unmapped(start_date), unmapped(end_date), unmapped(period)
+    )
+    save_raw_stock_data.map(
+        dfs_raw, [f"{ticker}_stock_data.csv" for ticker in tickers]
+    ).wait()
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data()
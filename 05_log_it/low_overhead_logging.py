@@ -0,0 +1,103 @@
+import logging
+import queue
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+import pandas as pd
+from prefect.logging.handlers import APILogHandler
+
+# Run logs pass through these; which hold handlers depends on the logging config
+RUN_LOGGERS = ("prefect.flow_runs", "prefect.task_runs", "prefect", "")
+
+
+def summarize_frame(df: pd.DataFrame, rows: int = 3) -> str:
+    """Describe a DataFrame in a few lines: shape, dtypes, nulls, head and tail."""
+    dtypes = df.dtypes.astype(str).value_counts()
+    nulls = df.isna().sum()
+    nulls = nulls[nulls > 0]
+    lines = [
+        f"DataFrame {df.shape[0]} rows x {df.shape[1]} columns",
+        "dtypes: " + ", ".join(f"{dtype}({count})" for dtype, count in dtypes.items()),
+        "nulls: "
+        + (", ".join(f"{column}={count}" for column, count in nulls.items()) or "none"),
+    ]
+    if len(df) > 2 * rows:
+        lines += [df.head(rows).to_string(), "...", df.tail(rows).to_string()]
+    else:
+        lines.append(df.to_string())
+    return "\n".join(lines)
+
+
+class FrameSummary:
+    """Log argument that renders summarize_frame only if the record is emitted.
+
+    The frame is not copied, so do not change it after logging it.
+    """
+
+    def __init__(self, df: pd.DataFrame, rows: int = 3):
+        self.df = df
+        self.rows = rows
+
+    def __str__(self) -> str:
+        return summarize_frame(self.df, self.rows)
+
+
+class LazyMessage:
+    """Log argument that calls fn(*args, **kwargs) only if the record is emitted.
+
+    logger.debug("%s", LazyMessage(expensive, df)) costs nothing when debug is off.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.fn(*self.args, **self.kwargs))
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Put records on the queue as they are, leaving the formatting to the listener.
+
+    The stdlib QueueHandler formats the message before queueing it, which would
+    render the message on the calling thread anyway.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+@contextmanager
+def queued_logging(logger_names=RUN_LOGGERS) -> Iterator[None]:
+    """Format and emit run logs on background threads instead of in the tasks.
+
+    Each logger's handlers (the console and the Prefect API handler) are moved
+    behind a queue, so logging a record only costs an enqueue. The API handler
+    already sends logs to the API in batches from its own worker. On exit the
+    queues are drained and the API logs are flushed. Loggers that are already
+    queued, by an enclosing queued_logging, are left as they are.
+    """
+    listeners = []
+    moved = {}
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        handlers = list(logger.handlers)
+        if not handlers or any(
+            isinstance(handler, DeferredQueueHandler) for handler in handlers
+        ):
+            continue
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        moved[name] = handlers
+        logger.handlers = [DeferredQueueHandler(records)]
+        listener.start()
+        listeners.append(listener)
+    try:
+        yield
+    finally:
+        for listener in listeners:
+            listener.stop()
+        for name, handlers in moved.items():
+            logging.getLogger(name).handlers = handlers
+        APILogHandler.flush()
@@ -0,0 +1,66 @@
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task
+from prefect.logging import get_run_logger
+from low_overhead_logging import (
+    FrameSummary,
+    LazyMessage,
+    queued_logging,
+    summarize_frame,
+)
+
+
+@task(retries=2)
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return df
+
+
+@task
+def save_raw_stock_data(df: pd.DataFrame, filename: str):
+    """Save the raw stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+
+
+@task
+def transform_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the moving average of the close price for the previous 3 days."""
+    stock_name = df.columns.get_level_values(1)[0]
+    df[("Moving Average Close", stock_name)] = df["Close"].rolling(window=3).mean()
+    logger = get_run_logger()
+    # only built when log level is set to debug
+    logger.debug("Transformed data:\n%s", LazyMessage(summarize_frame, df, rows=10))
+    return df
+
+
+@task
+def save_transformed_stock_data(df: pd.DataFrame, filename: str):
+    """Write the transformed stock data to a CSV file."""
+    df.to_csv(f"./data/{filename}")
+    get_run_logger().info("Saved transformed stock data to ./data/%s", filename)
+
+
+@flow
+def fetch_and_save_stock_data(
+    ticker: str = "AAPL",
+    start_date: str = "2025-02-01",
+    end_date: str = "2025-02-28",
+    period: str = "1d",
+):
+    """Main ETL workflow to fetch and save stock data."""
+    # Set up by the flow itself, so served and deployed runs get it too
+    with queued_logging():
+        df_raw = fetch_stock_data(ticker, start_date, end_date, period)
+        save_raw_stock_data(df_raw, f"{ticker}_stock_data.csv")
+        df_transformed = transform_stock_data(df_raw)
+        save_transformed_stock_data(
+            df_transformed, f"{ticker}_transformed_stock_data.csv"
+        )
+        get_run_logger().info("%s", FrameSummary(df_transformed))
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data(ticker="AMZN")
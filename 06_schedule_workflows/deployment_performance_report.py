@@ -0,0 +1,200 @@
+import math
+import os
+import pandas as pd
+from prefect import flow, task
+from prefect.artifacts import create_markdown_artifact
+from prefect.client.orchestration import get_client
+from prefect.client.schemas.filters import (
+    DeploymentFilter,
+    DeploymentFilterId,
+    FlowRunFilter,
+    FlowRunFilterId,
+    FlowRunFilterState,
+    FlowRunFilterStateType,
+)
+from prefect.client.schemas.objects import StateType
+from prefect.client.schemas.sorting import FlowRunSort
+
+# The API returns at most this many runs per request
+PAGE_SIZE = 200
+FLOW_RUN = "(flow run)"
+
+
+def to_markdown_table(df: pd.DataFrame) -> str:
+    """Render a DataFrame as a markdown table."""
+    header = "| " + " | ".join(str(column) for column in df.columns) + " |"
+    divider = "|" + " --- |" * len(df.columns)
+    rows = [
+        "| " + " | ".join("" if pd.isna(value) else str(value) for value in row) + " |"
+        for row in df.itertuples(index=False)
+    ]
+    return "\n".join([header, divider, *rows])
+
+
+def mann_whitney_greater(recent: pd.Series, baseline: pd.Series) -> float:
+    """One-sided Mann-Whitney U test that recent durations are larger than baseline.
+
+    Uses the normal approximation with a tie correction, which is accurate for
+    the sample sizes a run history gives (more than about 8 runs on each side).
+    """
+    n1, n2 = len(recent), len(baseline)
+    n = n1 + n2
+    ranks = pd.concat([recent, baseline], ignore_index=True).rank()
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    ties = ranks.value_counts()
+    tie_term = ((ties**3 - ties).sum()) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@task
+def fetch_run_history(deployment_name: str, max_runs: int = 500) -> pd.DataFrame:
+    """Read the durations of completed flow runs of a deployment and their task runs."""
+    with get_client(sync_client=True) as client:
+        deployment = client.read_deployment_by_name(deployment_name)
+        flow_runs = []
+        while len(flow_runs) < max_runs:
+            page = client.read_flow_runs(
+                deployment_filter=DeploymentFilter(
+                    id=DeploymentFilterId(any_=[deployment.id])
+                ),
+                flow_run_filter=FlowRunFilter(
+                    state=FlowRunFilterState(
+                        type=FlowRunFilterStateType(any_=[StateType.COMPLETED])
+                    )
+                ),
+                sort=FlowRunSort.START_TIME_DESC,
+                limit=min(PAGE_SIZE, max_runs - len(flow_runs)),
+                offset=len(flow_runs),
+            )
+            flow_runs += page
+            if len(page) < PAGE_SIZE:
+                break
+
+        rows = [
+            (run.id, run.start_time, FLOW_RUN, run.total_run_time.total_seconds())
+            for run in flow_runs
+        ]
+        for i in range(0, len(flow_runs), PAGE_SIZE):
+            ids = [run.id for run in flow_runs[i : i + PAGE_SIZE]]
+            offset = 0
+            while True:
+                task_runs = client.read_task_runs(
+                    flow_run_filter=FlowRunFilter(id=FlowRunFilterId(any_=ids)),
+                    limit=PAGE_SIZE,
+                    offset=offset,
+                )
+                rows += [
+                    (
+                        task_run.flow_run_id,
+                        task_run.start_time,
+                        # Task run names are the task name plus a random suffix
+                        task_run.name.rsplit("-", 1)[0],
+                        task_run.total_run_time.total_seconds(),
+                    )
+                    for task_run in task_runs
+                    if task_run.start_time is not None
+                ]
+                offset += len(task_runs)
+                if len(task_runs) < PAGE_SIZE:
+                    break
+
+    return pd.DataFrame(rows, columns=["flow_run_id", "start_time", "task", "seconds"])
+
+
+@task
+def summarize_durations(
+    history: pd.DataFrame,
+    recent_runs: int = 20,
+    alpha: float = 0.01,
+    min_slowdown: float = 0.1,
+) -> pd.DataFrame:
+    """Compute duration percentiles per task and flag significant regressions.
+
+    The latest recent_runs flow runs are compared with all earlier ones. A task
+    is flagged when the Mann-Whitney test rejects "no slower" at level alpha and
+    its median got at least min_slowdown (10%) slower, so tiny but consistent
+    shifts are not reported.
+    """
+    run_order = (
+        history[history["task"] == FLOW_RUN]
+        .sort_values("start_time", ascending=False)["flow_run_id"]
+        .tolist()
+    )
+    recent_ids = set(run_order[:recent_runs])
+
+    rows = []
+    for name, group in history.groupby("task"):
+        # A task that runs several times in a flow run counts once, with its total
+        per_run = group.groupby("flow_run_id")["seconds"].sum()
+        is_recent = per_run.index.isin(recent_ids)
+        recent, baseline = per_run[is_recent], per_run[~is_recent]
+        row = {
+            "task": name,
+            "runs": len(per_run),
+            "p50_s": per_run.quantile(0.5),
+            "p95_s": per_run.quantile(0.95),
+            "p99_s": per_run.quantile(0.99),
+            "recent_p50_s": recent.median() if len(recent) else None,
+            "baseline_p50_s": baseline.median() if len(baseline) else None,
+            "p_value": None,
+            "regression": False,
+        }
+        if len(recent) >= 8 and len(baseline) >= 8:
+            p_value = mann_whitney_greater(recent, baseline)
+            slowdown = recent.median() / baseline.median() - 1
+            row["p_value"] = p_value
+            row["regression"] = p_value < alpha and slowdown >= min_slowdown
+        rows.append(row)
+    return pd.DataFrame(rows).sort_values("p50_s", ascending=False)
+
+
+@task
+def save_report(summary: pd.DataFrame, deployment_name: str, filename: str) -> str:
+    """Write the report as a markdown artifact and to a local file."""
+    regressions = summary[summary["regression"]]
+    lines = [
+        f"# Performance of {deployment_name}",
+        "",
+        f"{summary['runs'].max()} completed runs; "
+        f"{len(regressions)} task(s) regressed in the latest runs.",
+        "",
+        to_markdown_table(summary.round(4)),
+    ]
+    markdown = "\n".join(lines)
+    os.makedirs("./data", exist_ok=True)
+    with open(f"./data/{filename}", "w") as f:
+        f.write(markdown)
+    create_markdown_artifact(
+        key="deployment-performance",
+        markdown=markdown,
+        description=f"Task duration percentiles for {deployment_name}",
+    )
+    print(f"Saved the performance report to ./data/{filename}")
+    for name in regressions["task"]:
+        print(f"Regression: {name} got slower in the latest runs")
+    return markdown
+
+
+@flow(log_prints=True)
+def report_deployment_performance(
+    deployment_name: str = "fetch-and-save-stock-data/fetch-and-save-snowflake-stock-data",
+    max_runs: int = 500,
+    recent_runs: int = 20,
+    alpha: float = 0.01,
+):
+    """Report task duration percentiles and regressions across a deployment's runs."""
+    history = fetch_run_history(deployment_name, max_runs)
+    if history.empty:
+        print(f"No completed runs of {deployment_name} yet")
+        return None
+    summary = summarize_durations(history, recent_runs, alpha)
+    filename = deployment_name.replace("/", "__") + "_performance.md"
+    return save_report(summary, deployment_name, filename)
+
+
+if __name__ == "__main__":
+    report_deployment_performance()
@@ -0,0 +1,244 @@
+import base64
+import functools
+import hashlib
+import os
+import shutil
+import sqlite3
+import subprocess
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+from prefect.blocks.system import Secret
+from prefect.runner.storage import GitRepository
+from prefect.utilities.asyncutils import run_sync_in_worker_thread
+
+
+@functools.cache
+def cached_secret(name: str) -> Secret:
+    """Secret.load once per process, so every deployment and run reuses the value."""
+    return Secret.load(name)
+
+
+def directory_size(path: Path) -> int:
+    """Total size in bytes of the files under path."""
+    return sum(
+        os.lstat(os.path.join(root, name)).st_size
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def auth_config(fetch_url: str) -> list[str]:
+    """git -c options that send the credentials in fetch_url to its host only.
+
+    remote.origin.url cannot be overridden with -c, since git appends the
+    value to the configured URL instead of replacing it. An Authorization
+    header scoped to the host also covers the blobs a partial clone fetches
+    lazily during checkout.
+    """
+    parts = urlsplit(fetch_url)
+    if parts.scheme not in ("http", "https") or not parts.username:
+        return []
+    credentials = f"{parts.username}:{parts.password or ''}".encode()
+    token = base64.b64encode(credentials).decode()
+    host_url = (
+        f"{parts.scheme}://{parts.hostname}{f':{parts.port}' if parts.port else ''}/"
+    )
+    return ["-c", f"http.{host_url}.extraHeader=Authorization: Basic {token}"]
+
+
+class GitRepoCache:
+    """Shallow checkouts of git repositories, one per URL and commit.
+
+    A checkout never changes once it is made, so any number of deployments
+    and runs can share it. Checkouts are fetched with --depth 1, plus
+    --filter=blob:none when only some directories are needed. The least
+    recently used checkouts are deleted once the cache is over max_bytes,
+    except the ones a destination still links to.
+    """
+
+    def __init__(
+        self, cache_dir: str = "./data/git_cache", max_bytes: int = 5 * 1024**3
+    ):
+        self.cache_dir = Path(cache_dir).absolute()
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.sqlite"
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS checkouts (key TEXT PRIMARY KEY, "
+                "url TEXT, commit_sha TEXT, size_bytes INTEGER, accessed_at REAL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS links "
+                "(destination TEXT PRIMARY KEY, key TEXT)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.index_path, timeout=30)) as db:
+            with db:
+                yield db
+
+    def _git(
+        self, args: list[str], cwd: Path | None = None, secret: bool = False
+    ) -> str:
+        try:
+            result = subprocess.run(
+                ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+            )
+        except subprocess.CalledProcessError as exc:
+            # Hide the command when it holds credentials
+            command = "git command" if secret else " ".join(exc.cmd)
+            raise RuntimeError(
+                f"{command} failed with exit code {exc.returncode}: {exc.stderr.strip()}"
+            ) from None
+        return result.stdout
+
+    def resolve(self, url: str, branch: str | None = None, secret: bool = False) -> str:
+        """Return the commit a branch (or the default branch) points to, without cloning."""
+        ref = f"refs/heads/{branch}" if branch else "HEAD"
+        output = self._git(["ls-remote", url, ref], secret=secret)
+        if not output.strip():
+            raise ValueError(f"Ref {ref!r} not found in the repository")
+        return output.split()[0]
+
+    def checkout(
+        self,
+        url: str,
+        commit: str,
+        fetch_url: str | None = None,
+        directories: list[str] | None = None,
+        include_submodules: bool = False,
+        destination: Path | None = None,
+    ) -> Path:
+        """Return a checkout of url at commit, fetching it if it is not cached yet.
+
+        fetch_url is the URL with credentials; it is passed on the command line
+        only, so the token is never written to the checkout's git config. The
+        checkout is never evicted while destination exists and links to it.
+        """
+        fetch_url = fetch_url or url
+        secret = fetch_url != url
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+        key = f"{url_hash}-{commit}"
+        if directories:
+            key += "-" + hashlib.sha256(" ".join(directories).encode()).hexdigest()[:8]
+        path = self.cache_dir / key
+
+        if not path.exists():
+            tmp_path = self.cache_dir / f"{key}.tmp-{os.getpid()}"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            self._git(["init", "-q", str(tmp_path)])
+            self._git(["remote", "add", "origin", url], cwd=tmp_path)
+            # Blobs outside the sparse directories are fetched lazily from origin
+            with_auth = auth_config(fetch_url)
+            fetch = ["fetch", "-q", "--depth", "1"]
+            if directories:
+                fetch += ["--filter=blob:none"]
+                self._git(["sparse-checkout", "set", *directories], cwd=tmp_path)
+            self._git(
+                [*with_auth, *fetch, "origin", commit], cwd=tmp_path, secret=secret
+            )
+            self._git(
+                [*with_auth, "checkout", "-q", "FETCH_HEAD"],
+                cwd=tmp_path,
+                secret=secret,
+            )
+            if include_submodules:
+                self._git(
+                    [*with_auth, "submodule", "update", "-q", "--init", "--depth", "1"],
+                    cwd=tmp_path,
+                    secret=secret,
+                )
+            try:
+                tmp_path.rename(path)
+            except OSError:
+                # Another process cached the same commit first
+                shutil.rmtree(tmp_path)
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO checkouts VALUES (?, ?, ?, ?, ?)",
+                    (key, url, commit, directory_size(path), time.time()),
+                )
+                self._link(db, destination, key)
+            self._evict(keep=key)
+        else:
+            with self._connect() as db:
+                db.execute(
+                    "UPDATE checkouts SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._link(db, destination, key)
+        return path
+
+    def _link(self, db: sqlite3.Connection, destination: Path | None, key: str):
+        if destination is not None:
+            db.execute(
+                "INSERT OR REPLACE INTO links VALUES (?, ?)",
+                (str(Path(destination).absolute()), key),
+            )
+
+    def _evict(self, keep: str):
+        """Delete the least recently used checkouts until the cache fits in max_bytes."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT key, size_bytes FROM checkouts ORDER BY accessed_at"
+            ).fetchall()
+            links = db.execute("SELECT destination, key FROM links").fetchall()
+            # Runs may be executing code from any checkout a destination links to
+            live = {keep} | {key for dest, key in links if os.path.lexists(dest)}
+            total = sum(size for _, size in rows)
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if key in live:
+                    continue
+                shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+                db.execute("DELETE FROM checkouts WHERE key = ?", (key,))
+                total -= size
+
+
+class CachedGitRepository(GitRepository):
+    """A GitRepository that checks out from a shared GitRepoCache.
+
+    On every pull it asks the remote which commit the branch points to; only
+    when the ref has moved is a new commit fetched into the cache, and the
+    destination is a symlink to the cached checkout, swapped atomically.
+    """
+
+    def __init__(self, *args, cache: GitRepoCache | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = cache or GitRepoCache()
+        self._commit = None
+
+    async def pull_code(self) -> None:
+        await run_sync_in_worker_thread(self._pull_from_cache)
+
+    def _pull_from_cache(self):
+        fetch_url = self._repository_url_with_credentials
+        secret = fetch_url != self._url
+        commit = self._cache.resolve(fetch_url, self._branch, secret=secret)
+        # Called on every pull, so a checkout in use stays recently used
+        path = self._cache.checkout(
+            self._url,
+            commit,
+            fetch_url,
+            self._directories,
+            self._include_submodules,
+            destination=self.destination,
+        )
+        # exists() follows the link, so a checkout deleted under it is linked again
+        if commit == self._commit and self.destination.exists():
+            return
+        self.destination.parent.mkdir(parents=True, exist_ok=True)
+        link = self.destination.with_name(f"{self.destination.name}.link-{os.getpid()}")
+        link.unlink(missing_ok=True)
+        link.symlink_to(path, target_is_directory=True)
+        if self.destination.is_dir() and not self.destination.is_symlink():
+            shutil.rmtree(self.destination)
+        os.replace(link, self.destination)
+        self._commit = commit
+        self._logger.debug("Using cached checkout of %s at %s", self._url, commit)
@@ -0,0 +1,89 @@
+import json
+import math
+import os
+import pandas as pd
+
+# Bumped whenever the saved layout changes, so older files trigger a full recompute
+STATE_VERSION = 2
+
+
+def new_indicator_state(sma_windows: list[int], ema_windows: list[int]) -> dict:
+    """Return the empty state a full recompute starts from."""
+    return {
+        "version": STATE_VERSION,
+        "last_date": None,
+        "sma": {str(window): [] for window in sma_windows},
+        "ema": {str(window): {"value": None, "weight": 1.0} for window in ema_windows},
+    }
+
+
+def load_indicator_state(path: str) -> dict | None:
+    """Load the saved rolling state for a ticker, if there is any."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_indicator_state(state: dict, path: str):
+    """Save the rolling state, replacing the file atomically."""
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def update_indicators(close: pd.Series, state: dict) -> tuple[pd.DataFrame, dict]:
+    """Compute the indicators for the given rows only, carrying the state forward.
+
+    The state holds the last window of closes for each SMA and the last value of
+    each EMA, so each new row costs O(window) no matter how long the history is.
+    Every output depends only on the state and the row itself, so feeding the
+    rows in one call or spread over many runs gives identical results.
+
+    Missing closes follow pandas: an SMA is NaN while a missing close is inside
+    its window, as with rolling(window).mean(), and an EMA carries its last value
+    over the gap and then weighs the stale value down by the rows it spans, as
+    with ewm(span=window, adjust=False).mean().
+    """
+    state = json.loads(json.dumps(state))
+    sma_state = {int(window): values for window, values in state["sma"].items()}
+    ema_state = {int(window): ema for window, ema in state["ema"].items()}
+    columns = {f"SMA {window} Close": [] for window in sma_state}
+    columns.update({f"EMA {window} Close": [] for window in ema_state})
+
+    for value in close.to_numpy(dtype="float64").tolist():
+        missing = math.isnan(value)
+
+        for window, values in sma_state.items():
+            # JSON has no NaN, so missing closes are kept as None
+            values.append(None if missing else value)
+            if len(values) > window:
+                values.pop(0)
+            complete = len(values) == window and None not in values
+            # fsum is exactly rounded, so the result does not depend on history
+            sma = math.fsum(values) / window if complete else math.nan
+            columns[f"SMA {window} Close"].append(sma)
+
+        for window, ema in ema_state.items():
+            # The same recursion, and so the same rounding, as pandas' ewm()
+            alpha = 1 / (1 + (window - 1) / 2)
+            if ema["value"] is None:
+                if not missing:
+                    ema["value"] = value
+            else:
+                ema["weight"] *= 1 - alpha
+                if not missing:
+                    if ema["value"] != value:
+                        ema["value"] = (
+                            ema["weight"] * ema["value"] + alpha * value
+                        ) / (ema["weight"] + alpha)
+                    ema["weight"] = 1.0
+            columns[f"EMA {window} Close"].append(
+                math.nan if ema["value"] is None else ema["value"]
+            )
+
+    state["sma"] = {str(window): values for window, values in sma_state.items()}
+    state["ema"] = {str(window): ema for window, ema in ema_state.items()}
+    if len(close):
+        state["last_date"] = close.index.max().strftime("%Y-%m-%d")
+    return pd.DataFrame(columns, index=close.index), state
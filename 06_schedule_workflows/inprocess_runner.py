@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import UUID
+import pandas as pd
+from prefect import Flow
+from prefect.client.orchestration import get_client
+from prefect.client.schemas.objects import FlowRun
+from prefect.client.schemas.responses import SetStateStatus
+from prefect.flow_engine import run_flow
+from prefect.states import Crashed, Pending
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values, q: float) -> float | None:
+    return float(pd.Series(values).quantile(q)) if values else None
+
+
+class InProcessRunner:
+    """Serve many deployments from one process, running their flows in threads.
+
+    Unlike flow.serve() and prefect.serve(), which start a new Python process
+    for every flow run, the runs execute in a thread pool inside this process.
+    Flow modules are imported once, and module-level state such as HTTP client
+    sessions stays warm from one run to the next.
+
+    global_limit caps the runs in flight across all deployments; each
+    deployment also gets its own limit. Runs that are due but over a limit wait
+    in a per-deployment queue. metrics() reports the queue depth and, per
+    deployment, how late runs started and how long they took.
+    """
+
+    def __init__(
+        self,
+        global_limit: int = 8,
+        poll_seconds: float = 10,
+        prefetch_seconds: float = 30,
+        history_size: int = 500,
+    ):
+        self.global_limit = global_limit
+        self.poll_seconds = poll_seconds
+        self.prefetch_seconds = prefetch_seconds
+        self.name = f"in-process-runner-{socket.gethostname()}-{os.getpid()}"
+        self._lock = threading.Lock()
+        self._flows: dict[UUID, Flow] = {}
+        self._names: dict[UUID, str] = {}
+        self._limits: dict[UUID, int] = {}
+        self._queues: dict[UUID, deque[FlowRun]] = {}
+        self._running: dict[UUID, int] = {}
+        self._seen: set[UUID] = set()
+        self._start_delays: dict[UUID, deque[float]] = {}
+        self._durations: dict[UUID, deque[float]] = {}
+        self._history_size = history_size
+        self._executor = ThreadPoolExecutor(global_limit, thread_name_prefix="flow-run")
+
+    def add(self, flow: Flow, name: str, limit: int = 1, **deployment_kwargs) -> UUID:
+        """Create or update a deployment of flow that this runner will execute."""
+        deployment_id = flow.to_deployment(name=name, **deployment_kwargs).apply()
+        self._flows[deployment_id] = flow
+        self._names[deployment_id] = f"{flow.name}/{name}"
+        self._limits[deployment_id] = limit
+        self._queues[deployment_id] = deque()
+        self._running[deployment_id] = 0
+        self._start_delays[deployment_id] = deque(maxlen=self._history_size)
+        self._durations[deployment_id] = deque(maxlen=self._history_size)
+        return deployment_id
+
+    def poll(self, client):
+        """Queue the scheduled runs of our deployments that are due soon."""
+        scheduled_before = datetime.now(timezone.utc) + timedelta(
+            seconds=self.prefetch_seconds
+        )
+        flow_runs = client.get_scheduled_flow_runs_for_deployments(
+            deployment_ids=list(self._flows), scheduled_before=scheduled_before
+        )
+        with self._lock:
+            for flow_run in sorted(flow_runs, key=lambda run: run.expected_start_time):
+                if flow_run.id not in self._seen:
+                    self._seen.add(flow_run.id)
+                    self._queues[flow_run.deployment_id].append(flow_run)
+
+    def dispatch(self, client):
+        """Start every queued run that is due and fits under both limits."""
+        now = datetime.now(timezone.utc)
+        for deployment_id, queue in self._queues.items():
+            while queue:
+                with self._lock:
+                    if sum(self._running.values()) >= self.global_limit:
+                        return
+                    if self._running[deployment_id] >= self._limits[deployment_id]:
+                        break
+                    if queue[0].expected_start_time > now:
+                        break
+                    flow_run = queue.popleft()
+                    self._running[deployment_id] += 1
+                try:
+                    # Claim the run, so another runner polling the same deployment skips it
+                    claim = Pending(message=f"Claimed by {self.name}")
+                    result = client.set_flow_run_state(flow_run.id, claim)
+                    # A retried request can be rejected as a duplicate of our own claim
+                    claimed = result.status == SetStateStatus.ACCEPT or (
+                        result.state is not None
+                        and result.state.message == claim.message
+                    )
+                    if claimed:
+                        self._executor.submit(self._execute, deployment_id, flow_run)
+                except Exception:
+                    # Release the slot and retry the run on the next dispatch
+                    self._finish(deployment_id, flow_run)
+                    with self._lock:
+                        self._seen.add(flow_run.id)
+                        queue.appendleft(flow_run)
+                    raise
+                if not claimed:
+                    self._finish(deployment_id, flow_run)
+
+    def _execute(self, deployment_id: UUID, flow_run: FlowRun):
+        started = datetime.now(timezone.utc)
+        start_delay = (started - flow_run.expected_start_time).total_seconds()
+        try:
+            run_flow(self._flows[deployment_id], flow_run=flow_run, return_type="state")
+        except Exception as exc:
+            # The engine could not run the flow at all; don't leave the run Pending
+            logger.exception(f"Flow run {flow_run.name!r} could not be executed")
+            with get_client(sync_client=True) as client:
+                client.set_flow_run_state(
+                    flow_run.id,
+                    Crashed(message=f"Execution failed: {exc!r}"),
+                    force=True,
+                )
+        finally:
+            duration = (datetime.now(timezone.utc) - started).total_seconds()
+            self._finish(deployment_id, flow_run, start_delay, duration)
+
+    def _finish(self, deployment_id, flow_run, start_delay=None, duration=None):
+        with self._lock:
+            self._running[deployment_id] -= 1
+            self._seen.discard(flow_run.id)
+            if duration is not None:
+                self._start_delays[deployment_id].append(start_delay)
+                self._durations[deployment_id].append(duration)
+
+    def metrics(self) -> dict:
+        """Queue depth, runs in flight and latency percentiles, overall and per deployment."""
+        with self._lock:
+            deployments = {
+                self._names[deployment_id]: {
+                    "queued": len(self._queues[deployment_id]),
+                    "running": self._running[deployment_id],
+                    "completed": len(self._durations[deployment_id]),
+                    "start_delay_p50_s": percentile(
+                        self._start_delays[deployment_id], 0.5
+                    ),
+                    "start_delay_p95_s": percentile(
+                        self._start_delays[deployment_id], 0.95
+                    ),
+                    "duration_p50_s": percentile(self._durations[deployment_id], 0.5),
+                    "duration_p95_s": percentile(self._durations[deployment_id], 0.95),
+                }
+                for deployment_id in self._flows
+            }
+        return {
+            "queued": sum(d["queued"] for d in deployments.values()),
+            "running": sum(d["running"] for d in deployments.values()),
+            "global_limit": self.global_limit,
+            "deployments": deployments,
+        }
+
+    def serve_metrics(self, port: int) -> ThreadingHTTPServer:
+        """Serve metrics() as JSON at http://localhost:{port}/metrics."""
+        runner = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = json.dumps(runner.metrics()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def start(self, metrics_port: int | None = None, report_seconds: float = 60):
+        """Poll and dispatch until interrupted, then wait for runs in flight."""
+        if metrics_port is not None:
+            self.serve_metrics(metrics_port)
+        print(
+            f"Serving {len(self._flows)} deployments, up to {self.global_limit} runs at once"
+        )
+        last_poll = last_report = 0.0
+        try:
+            with get_client(sync_client=True) as client:
+                while True:
+                    try:
+                        if time.monotonic() - last_poll >= self.poll_seconds:
+                            self.poll(client)
+                            last_poll = time.monotonic()
+                        self.dispatch(client)
+                        if time.monotonic() - last_report >= report_seconds:
+                            metrics = self.metrics()
+                            print(
+                                f"queued={metrics['queued']} running={metrics['running']}"
+                            )
+                            last_report = time.monotonic()
+                    except Exception:
+                        # An API outage must not stop the runner; try again next time
+                        logger.exception("Polling or dispatching flow runs failed")
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            print("Waiting for the runs in flight to finish")
+        finally:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,16 @@
+from prefect import flow
+from git_repo_cache import CachedGitRepository, cached_secret
+
+if __name__ == "__main__":
+    my_private_github_repo = CachedGitRepository(
+        url="https://github.com/org/my-private-repo.git",
+        credentials={"access_token": cached_secret("gh-repo-access-token")},
+    )
+
+    flow.from_source(
+        source=my_private_github_repo,
+        entrypoint="path/to/my_remote_flow_code_file.py:entrypoint function",
+    ).serve(
+        name="stock-data-from-private-gh-repo",
+        cron="0 0 * * *",
+    )
@@ -0,0 +1,158 @@
+import math
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import pandas as pd
+import yfinance as yf
+from croniter import croniter
+from prefect import flow, serve, task
+from prefect.runtime import flow_run
+from prefect.schedules import Cron, Interval, Schedule
+
+TIMEZONE = "America/New_York"
+SCHEDULES = [
+    Cron("1 1 1 1 1", timezone=TIMEZONE),
+    Interval(timedelta(days=1), anchor_date=datetime(2025, 1, 1), timezone=TIMEZONE),
+]
+
+
+def slot_times(
+    schedule: Schedule, start: datetime, end: datetime
+) -> Iterator[datetime]:
+    """The slots of a Cron or Interval schedule in [start, end).
+
+    start, end and the slots are naive wall-clock times in the schedule's
+    time zone. Like the Prefect server, cron slots and intervals of whole
+    days keep their wall-clock time across DST, while shorter intervals tick
+    in absolute time.
+    """
+    tz = ZoneInfo(schedule.timezone or "UTC")
+    if schedule.cron:
+        # croniter returns the first slot after its start, so begin just before
+        slots = croniter(
+            schedule.cron, start - timedelta(seconds=1), day_or=schedule.day_or
+        )
+        while (slot := slots.get_next(datetime)) < end:
+            yield slot
+        return
+
+    if schedule.interval is None:
+        raise ValueError("Only Cron and Interval schedules can be backfilled")
+    anchor = schedule.anchor_date
+    anchor = (
+        anchor.replace(tzinfo=tz) if anchor.tzinfo is None else anchor.astimezone(tz)
+    )
+    if schedule.interval % timedelta(days=1):
+        # Step through shorter intervals in UTC, then read each slot off the wall clock
+        anchor = anchor.astimezone(timezone.utc)
+        start = start.replace(tzinfo=tz).astimezone(timezone.utc)
+        end = end.replace(tzinfo=tz).astimezone(timezone.utc)
+    else:
+        anchor = anchor.replace(tzinfo=None)
+    slot = anchor + math.ceil((start - anchor) / schedule.interval) * schedule.interval
+    while slot < end:
+        yield slot.astimezone(tz).replace(tzinfo=None) if slot.tzinfo else slot
+        slot += schedule.interval
+
+
+def schedule_slot_dates(
+    schedules: list[Schedule], start_date: str, end_date: str
+) -> list[date]:
+    """Return the days from start_date through end_date, inclusive, with a scheduled slot.
+
+    Each schedule's slots are computed in its own time zone, the way the
+    Prefect server schedules runs.
+    """
+    start = datetime.fromisoformat(start_date)
+    end = datetime.fromisoformat(end_date) + timedelta(days=1)
+    slot_days = set()
+    for schedule in schedules:
+        slot_days.update(slot.date() for slot in slot_times(schedule, start, end))
+    return sorted(slot_days)
+
+
+@task(retries=2)
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return df
+
+
+def slot_window(df: pd.DataFrame, run_date: date, window_days: int) -> pd.DataFrame:
+    """The rows a run on run_date sees: the window_days days before it."""
+    end = pd.Timestamp(run_date)
+    return df[(df.index >= end - pd.Timedelta(days=window_days)) & (df.index < end)]
+
+
+@task
+def transform_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute the moving average of the close price for the previous 3 days."""
+    stock_name = df.columns.get_level_values(1)[0]
+    df[("Moving Average Close", stock_name)] = df["Close"].rolling(window=3).mean()
+    return df
+
+
+@task
+def save_daily_stock_data(
+    df_raw: pd.DataFrame, df_transformed: pd.DataFrame, ticker: str, run_date: date
+):
+    """Save the raw and transformed stock data of one day's run to CSV files."""
+    df_raw.to_csv(f"./data/{ticker}_stock_data_{run_date}.csv")
+    df_transformed.to_csv(f"./data/{ticker}_transformed_stock_data_{run_date}.csv")
+    print(f"Saved the stock data for the {run_date} run")
+
+
+@flow(log_prints=True)
+def fetch_and_save_stock_data(
+    ticker: str = "SNOW",
+    window_days: int = 28,
+    period: str = "1d",
+):
+    """Fetch the window_days before the scheduled day and save them for that day."""
+    run_date = pd.Timestamp(flow_run.scheduled_start_time).tz_convert(TIMEZONE).date()
+    start_date = run_date - timedelta(days=window_days)
+    df_raw = fetch_stock_data(ticker, str(start_date), str(run_date), period)
+    df_transformed = transform_stock_data(df_raw.copy())
+    save_daily_stock_data(df_raw, df_transformed, ticker, run_date)
+
+
+@flow(log_prints=True)
+def backfill_stock_data(
+    start_date: str,
+    end_date: str,
+    ticker: str = "SNOW",
+    window_days: int = 28,
+    period: str = "1d",
+):
+    """Catch up on the missed schedule slots from start_date through end_date in one run.
+
+    The union of all the slots' windows is fetched in a single request, then
+    each day's output is written exactly as its own scheduled run would have.
+    """
+    run_dates = schedule_slot_dates(SCHEDULES, start_date, end_date)
+    if not run_dates:
+        print(f"No scheduled slots between {start_date} and {end_date}")
+        return
+    fetch_start = run_dates[0] - timedelta(days=window_days)
+    df_all = fetch_stock_data(ticker, str(fetch_start), str(run_dates[-1]), period)
+    print(f"Fetched {len(df_all)} rows once for {len(run_dates)} missed runs")
+
+    for run_date in run_dates:
+        df_raw = slot_window(df_all, run_date, window_days)
+        df_transformed = transform_stock_data(df_raw.copy())
+        save_daily_stock_data(df_raw, df_transformed, ticker, run_date)
+
+
+if __name__ == "__main__":
+    serve(
+        fetch_and_save_stock_data.to_deployment(
+            name="fetch-and-save-snowflake-stock-data",
+            schedules=SCHEDULES,
+        ),
+        # Run on demand with the range the scheduled deployment missed
+        backfill_stock_data.to_deployment(
+            name="backfill-snowflake-stock-data",
+        ),
+    )
@@ -0,0 +1,190 @@
+import os
+from datetime import date, timedelta
+import pandas as pd
+import yfinance as yf
+from prefect import flow, task
+from indicator_state import (
+    STATE_VERSION,
+    load_indicator_state,
+    new_indicator_state,
+    save_indicator_state,
+    update_indicators,
+)
+
+# Stored dates further apart than this are treated as a gap to re-fetch.
+# Weekends and market holidays never leave more than 4 calendar days between rows.
+MAX_GAP_DAYS = 5
+
+
+def missing_date_ranges(
+    df_stored: pd.DataFrame | None, start_date: str, end_date: str
+) -> list[tuple[str, str]]:
+    """Return the [start, end) windows of the requested range not covered by the store."""
+    if df_stored is None or df_stored.empty:
+        return [(start_date, end_date)]
+
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    dates = df_stored.index[(df_stored.index >= start) & (df_stored.index < end)]
+    if dates.empty:
+        return [(start_date, end_date)]
+
+    ranges = []
+    if start < dates[0] - pd.Timedelta(days=MAX_GAP_DAYS - 1):
+        ranges.append((start, dates[0]))
+    for previous, current in zip(dates[:-1], dates[1:]):
+        if current - previous > pd.Timedelta(days=MAX_GAP_DAYS):
+            ranges.append((previous + pd.Timedelta(days=1), current))
+    if dates[-1] + pd.Timedelta(days=1) < end:
+        ranges.append((dates[-1] + pd.Timedelta(days=1), end))
+
+    return [(s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")) for s, e in ranges]
+
+
+@task
+def load_stored_stock_data(filename: str) -> pd.DataFrame | None:
+    """Load previously saved raw stock data, if there is any."""
+    path = f"./data/{filename}"
+    if not os.path.exists(path):
+        return None
+    # round_trip parsing reads back exactly the floats that were written
+    return pd.read_csv(
+        path, header=[0, 1], index_col=0, parse_dates=True, float_precision="round_trip"
+    )
+
+
+@task(retries=2)
+def fetch_stock_data(
+    ticker: str, start_date: str, end_date: str, period: str = "1d"
+) -> pd.DataFrame:
+    """Fetch the stock data from Yahoo Finance."""
+    df = yf.download(ticker, start=start_date, end=end_date, period=period)
+    return df
+
+
+@task
+def merge_raw_stock_data(
+    df_stored: pd.DataFrame | None, dfs_new: list[pd.DataFrame], filename: str
+) -> tuple[pd.DataFrame | None, pd.DataFrame]:
+    """Add newly fetched rows to the stored raw data without touching existing rows."""
+    path = f"./data/{filename}"
+    dfs_new = [df for df in dfs_new if not df.empty]
+    if not dfs_new:
+        return df_stored, pd.DataFrame()
+
+    df_new = pd.concat(dfs_new).sort_index()
+    if df_stored is None:
+        df_new.to_csv(path)
+        return df_new, df_new
+
+    df_new = df_new[~df_new.index.isin(df_stored.index)]
+    df_new = df_new.reindex(columns=df_stored.columns)
+    if df_new.empty:
+        return df_stored, df_new
+
+    if df_new.index.min() > df_stored.index.max():
+        # New rows only extend the tail, so append them to the existing file
+        df_new.to_csv(path, mode="a", header=False)
+        return pd.concat([df_stored, df_new]), df_new
+
+    # Backfilled rows land before or inside the stored range
+    df_merged = pd.concat([df_stored, df_new]).sort_index()
+    df_merged.to_csv(path)
+    return df_merged, df_new
+
+
+@task
+def transform_stock_data(
+    df_raw: pd.DataFrame,
+    df_new: pd.DataFrame,
+    state: dict | None,
+    sma_windows: list[int],
+    ema_windows: list[int],
+) -> tuple[pd.DataFrame, dict, bool]:
+    """Compute moving averages for the new rows only, when the saved state allows it."""
+    stock_name = df_raw.columns.get_level_values(1)[0]
+    df_history = df_raw[~df_raw.index.isin(df_new.index)]
+    incremental = (
+        state is not None
+        and state.get("version") == STATE_VERSION
+        and not df_history.empty
+        and state["last_date"] == df_history.index.max().strftime("%Y-%m-%d")
+        and df_new.index.min() > df_history.index.max()
+        and sorted(map(int, state["sma"])) == sorted(sma_windows)
+        and sorted(map(int, state["ema"])) == sorted(ema_windows)
+    )
+    if incremental:
+        df = df_new
+    else:
+        # Backfills, changed indicators or an old state layout invalidate the state
+        df = df_raw
+        state = new_indicator_state(sma_windows, ema_windows)
+
+    df_indicators, state = update_indicators(df["Close"][stock_name], state)
+    df_indicators.columns = pd.MultiIndex.from_product(
+        [df_indicators.columns, [stock_name]]
+    )
+    return pd.concat([df, df_indicators], axis=1), state, incremental
+
+
+@task
+def save_transformed_stock_data(
+    df: pd.DataFrame, state: dict, incremental: bool, ticker: str
+):
+    """Write or append the transformed stock data, then save the rolling state."""
+    path = f"./data/{ticker}_transformed_stock_data.csv"
+    if incremental:
+        df.to_csv(path, mode="a", header=False)
+        print(f"Appended {len(df)} transformed rows to {path}")
+    else:
+        df.to_csv(path)
+        print(f"Saved transformed stock data to {path}")
+    save_indicator_state(state, f"./data/{ticker}_indicator_state.json")
+
+
+@flow(log_prints=True)
+def fetch_and_save_stock_data(
+    ticker: str = "AAPL",
+    start_date: str = "2025-02-01",
+    end_date: str | None = None,
+    period: str = "1d",
+    sma_windows: list[int] | None = None,
+    ema_windows: list[int] | None = None,
+):
+    """Fetch only the dates missing from the stored data and update the outputs."""
+    if end_date is None:
+        # Yahoo Finance treats end_date as exclusive, so include today
+        end_date = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    if sma_windows is None:
+        sma_windows = [3]
+    if ema_windows is None:
+        ema_windows = [12]
+
+    raw_filename = f"{ticker}_stock_data.csv"
+    df_stored = load_stored_stock_data(raw_filename)
+    ranges = missing_date_ranges(df_stored, start_date, end_date)
+    if not ranges:
+        print(f"{ticker} data is already up to date through {end_date}")
+        return
+
+    dfs_new = [fetch_stock_data(ticker, start, end, period) for start, end in ranges]
+    df_raw, df_new = merge_raw_stock_data(df_stored, dfs_new, raw_filename)
+    print(f"Fetched {len(df_new)} new rows for {ticker} in {len(ranges)} request(s)")
+    if df_new.empty:
+        return
+
+    state = load_indicator_state(f"./data/{ticker}_indicator_state.json")
+    if not os.path.exists(f"./data/{ticker}_transformed_stock_data.csv"):
+        # Nothing to append to, so rebuild the transformed file from all the raw rows
+        state = None
+    df_transformed, state, incremental = transform_stock_data(
+        df_raw, df_new, state, sma_windows, ema_windows
+    )
+    save_transformed_stock_data(df_transformed, state, incremental, ticker)
+
+
+if __name__ == "__main__":
+    fetch_and_save_stock_data.serve(
+        name="fetch-and-save-snowflake-stock-data-incremental",
+        cron="0 0 * * *",
+    )
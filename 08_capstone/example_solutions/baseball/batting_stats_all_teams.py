@@ -0,0 +1,154 @@
+import asyncio
+import httpx
+from prefect import flow, task
+from game_stats_store import GameStatsStore
+from payload_cache import PayloadCache
+from schedule_cache import SCHEDULE_URL, ScheduleCache, is_final, schedule_params
+
+TEAMS_URL = "https://statsapi.mlb.com/api/v1/teams"
+BOXSCORE_URL = "https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
+SEASON_START = "2024-01-01"
+schedule_cache = ScheduleCache()
+payload_cache = PayloadCache()
+game_stats_store = GameStatsStore()
+
+
+async def get_json(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    params: dict | None = None,
+) -> dict:
+    """GET a JSON payload once one of the concurrency slots is free."""
+    async with semaphore:
+        response = await client.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_team_most_recent_game(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, team_id: int
+) -> dict | None:
+    """Refresh one team's cached schedule and return its most recent Final game."""
+    start_date, end_date = schedule_cache.pending_range(team_id, SEASON_START)
+    params = schedule_params(team_id, start_date, end_date)
+    schedule_data = await get_json(client, semaphore, SCHEDULE_URL, params)
+    schedule_cache.merge(team_id, SEASON_START, schedule_data.get("dates", []))
+    return schedule_cache.latest_final_game(team_id)
+
+
+async def get_boxscore(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, game: dict
+) -> dict:
+    """A game's box score, read through the payload cache."""
+    game_id = game["gamePk"]
+    boxscore = payload_cache.get("boxscore", game_id)
+    if boxscore is None:
+        url = BOXSCORE_URL.format(game_id=game_id)
+        boxscore = await get_json(client, semaphore, url)
+        payload_cache.put("boxscore", game_id, boxscore, is_final(game))
+    return boxscore
+
+
+@task
+async def get_league_games(max_concurrency: int = 8) -> list[tuple[dict, dict, dict]]:
+    """Get the most recent Final game and its box score for every MLB team.
+
+    All requests share one pooled AsyncClient, with at most max_concurrency
+    in flight. When two teams played each other, their box score is fetched
+    once, and a Final game's box score is read from the payload cache on
+    later runs. Returns (team, game, boxscore) for every team with a Final
+    game.
+    """
+    limits = httpx.Limits(
+        max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        teams_data = await get_json(client, semaphore, TEAMS_URL, {"sportId": 1})
+        teams = teams_data["teams"]
+        games = await asyncio.gather(
+            *(
+                get_team_most_recent_game(client, semaphore, team["id"])
+                for team in teams
+            )
+        )
+        unique_games = {game["gamePk"]: game for game in games if game}
+        boxscores = await asyncio.gather(
+            *(get_boxscore(client, semaphore, game) for game in unique_games.values())
+        )
+
+    print(f"{len(unique_games)} box scores needed for {len(teams)} teams")
+    boxscore_by_id = dict(zip(unique_games, boxscores))
+    return [
+        (team, game, boxscore_by_id[game["gamePk"]])
+        for team, game in zip(teams, games)
+        if game
+    ]
+
+
+def summarize_game(team: dict, game: dict, boxscore: dict) -> dict:
+    """Basic game info and team batting stats, from one team's side."""
+    is_home = game["teams"]["home"]["team"]["id"] == team["id"]
+    team_side = "home" if is_home else "away"
+    opponent_side = "away" if is_home else "home"
+    opponent = game["teams"][opponent_side]
+
+    result = {
+        "team": team["name"],
+        "game_id": game["gamePk"],
+        "date": game["gameDate"],
+        "official_date": game.get("officialDate"),
+        "opponent": opponent["team"]["name"],
+        "status": game["status"]["detailedState"],
+        "score": f"{team['name']} {game['teams'][team_side]['score']} - {opponent['team']['name']} {opponent['score']}",
+        "result": "WIN" if game["teams"][team_side]["isWinner"] else "LOSS",
+    }
+
+    try:
+        batting = boxscore["teams"][team_side]["teamStats"]["batting"]
+        result["runs"] = batting["runs"]
+        result["hits"] = batting["hits"]
+        result["home_runs"] = batting["homeRuns"]
+    except KeyError as e:
+        result["stats_error"] = f"Could not retrieve complete stats: {str(e)}"
+
+    return result
+
+
+@task
+def summarize_league_games(league_games: list[tuple[dict, dict, dict]]) -> list[dict]:
+    """Summarize every team's most recent game"""
+    return [summarize_game(*team_game) for team_game in league_games]
+
+
+@task
+def print_league_batting_stats(stats: list[dict]):
+    """Print one line of batting stats per team"""
+    print("\n" + "=" * 80)
+    for team_stats in stats:
+        print(
+            f"{team_stats['team']:<24} {team_stats['result']:<5} {team_stats['score']:<56} "
+            f"{team_stats.get('hits', '-')} H, {team_stats.get('runs', '-')} R, {team_stats.get('home_runs', '-')} HR"
+        )
+    print("=" * 80)
+
+
+@task
+def save_league_game_stats(stats: list[dict]):
+    """Append every team's game stats to the game stats store"""
+    game_stats_store.append(stats)
+    print(f"Game stats appended to {game_stats_store.base_dir}")
+
+
+@flow(log_prints=True)
+async def assemble_league_game_stats(max_concurrency: int = 8):
+    """Get, print and save the most recent game stats for all 30 MLB teams"""
+    league_games = await get_league_games(max_concurrency)
+    stats = summarize_league_games(league_games)
+    print_league_batting_stats(stats)
+    save_league_game_stats(stats)
+
+
+if __name__ == "__main__":
+    assemble_league_game_stats.serve(name="league-batting-stats", cron="* * * * *")
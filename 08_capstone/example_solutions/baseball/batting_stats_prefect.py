@@ -1,58 +1,51 @@
-import csv
 import httpx
-from datetime import datetime
 from prefect import flow, task
+from prefect.context import TaskRunContext
+from prefect.states import Completed
+from circuit_breaker import CircuitBreaker
+from game_stats_store import GameStatsStore
+from payload_cache import PayloadCache
+from schedule_cache import ScheduleCache, fetch_schedule_dates, is_final
+
+MLB_HOST = "statsapi.mlb.com"
+SEASON_START = "2024-01-01"
+# Shared by every run on the machine, so an MLB API outage fails fast
+breaker = CircuitBreaker(failure_threshold=3, reset_timeout=120)
+
+
+def guarded_fetch_schedule_dates(
+    team_id: int, start_date: str, end_date: str
+) -> list[dict]:
+    """Download a team's schedule through the MLB API circuit breaker."""
+    with breaker.guard(MLB_HOST):
+        return fetch_schedule_dates(team_id, start_date, end_date)
+
+
+schedule_cache = ScheduleCache(fetch=guarded_fetch_schedule_dates)
+payload_cache = PayloadCache()
+game_stats_store = GameStatsStore()
+
+
+def game_cache_key(context: TaskRunContext, parameters: dict) -> str | None:
+    """Cache a task on the game it handles, that game's state and the team"""
+    game = next(iter(parameters.values()))
+    if "gamePk" in game:
+        game_id, state = game["gamePk"], game["status"]["detailedState"]
+        team = parameters["team_id"]
+    elif "game_id" in game:
+        game_id, state, team = game["game_id"], game["status"], game["team"]
+    else:
+        # No game was found, so there is nothing to skip
+        return None
+    return f"{context.task.name}-{game_id}-{state}-{team}"
 
 
 @task
 def get_nationals_most_recent_game(team_id: int = 120):
     """Get stats for the most recent Washington Nationals game"""
 
-    today = datetime.now()
-
-    # Get the current season schedule
-    schedule_url = "https://statsapi.mlb.com/api/v1/schedule"
-    schedule_params = {
-        "teamId": team_id,
-        "sportId": 1,  # MLB
-        "startDate": "2024-01-01",
-        "endDate": today.strftime("%Y-%m-%d"),
-        "gameType": [
-            "R",
-            "P",
-        ],  # Regular season & postseason games
-    }
-
-    schedule_response = httpx.get(url=schedule_url, params=schedule_params)
-    schedule_data = schedule_response.json()
-
-    # Find the most recent completed game
-    most_recent_game = None
-    most_recent_date = None
-
-    if "dates" in schedule_data:
-        # Sort dates in reverse chronological order
-        sorted_dates = sorted(
-            schedule_data["dates"], key=lambda x: x["date"], reverse=True
-        )
-
-        for date_data in sorted_dates:
-            for game in date_data["games"]:
-                # Check if the game is completed
-                if game["status"]["abstractGameState"] == "Final":
-                    game_date = datetime.strptime(date_data["date"], "%Y-%m-%d")
-
-                    # If we haven't found a game yet, or the current one is more recent
-                    if most_recent_date is None or game_date > most_recent_date:
-                        most_recent_game = game
-                        most_recent_date = game_date
-
-                        # Since we're already sorted, the first Final game we find is most recent
-                        break
-
-            # If we found a game on this date, we're done
-            if most_recent_game:
-                break
+    # Only the dates after the last fully Final one are requested again
+    most_recent_game = schedule_cache.most_recent_final_game(team_id, SEASON_START)
 
     # If no completed games found
     if not most_recent_game:
@@ -61,29 +54,40 @@ def get_nationals_most_recent_game(team_id: int = 120):
     return most_recent_game
 
 
-@task
-def get_game_data(most_recent_game: dict) -> dict:
+@task(cache_key_fn=game_cache_key)
+def get_game_data(most_recent_game: dict, team_id: int = 120) -> dict:
     """Get detailed box score stats for a given game ID"""
 
     game_id = most_recent_game["gamePk"]
 
-    # Get detailed box score stats
+    # Get detailed box score stats; a Final game's box score is only fetched once
     boxscore_url = f"https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
-    boxscore_response = httpx.get(url=boxscore_url)
-    boxscore = boxscore_response.json()
 
-    # Determine if Nationals are home or away
-    is_home = most_recent_game["teams"]["home"]["team"]["id"] == 120
+    def fetch_boxscore() -> dict:
+        with breaker.guard(MLB_HOST):
+            boxscore_response = httpx.get(url=boxscore_url)
+            # An error body must not be cached as the box score of a Final game
+            boxscore_response.raise_for_status()
+        return boxscore_response.json()
+
+    boxscore = payload_cache.get_or_fetch(
+        "boxscore", game_id, is_final(most_recent_game), fetch_boxscore
+    )
+
+    # Determine if the team is home or away
+    is_home = most_recent_game["teams"]["home"]["team"]["id"] == team_id
     nats_side = "home" if is_home else "away"
     opponent_side = "away" if is_home else "home"
 
     # Store basic game info in a dictionary
     result = {
         "game_id": game_id,
+        "team": most_recent_game["teams"][nats_side]["team"]["name"],
         "date": most_recent_game["gameDate"],
+        "official_date": most_recent_game.get("officialDate"),
         "opponent": most_recent_game["teams"][opponent_side]["team"]["name"],
         "status": most_recent_game["status"]["detailedState"],
-        "score": f"Nationals {most_recent_game['teams'][nats_side]['score']} - {most_recent_game['teams'][opponent_side]['team']['name']} {most_recent_game['teams'][opponent_side]['score']}",
+        "score": f"{most_recent_game['teams'][nats_side]['team']['name']} {most_recent_game['teams'][nats_side]['score']} - {most_recent_game['teams'][opponent_side]['team']['name']} {most_recent_game['teams'][opponent_side]['score']}",
     }
 
     # Add win/loss information
@@ -107,7 +111,7 @@ def get_game_data(most_recent_game: dict) -> dict:
     return result
 
 
-@task
+@task(cache_key_fn=game_cache_key)
 def print_batting_stats(stats):
     """Print batting stats in a nicely formatted table"""
 
@@ -115,7 +119,7 @@ def print_batting_stats(stats):
         print(f"ERROR: {stats['error']}")
         return
     print("\n" + "=" * 80)
-    print(f"WASHINGTON NATIONALS - {stats['date']} vs {stats['opponent']}")
+    print(f"{stats['team'].upper()} - {stats['date']} vs {stats['opponent']}")
     print(f"Result: {stats['result']} - {stats['score']}")
     print("=" * 80)
     print(
@@ -123,31 +127,29 @@ def print_batting_stats(stats):
     )
 
 
-@task
+@task(cache_key_fn=game_cache_key)
 def save_game_stats(game_data: dict):
-    """Save game stats to a CSV file"""
-
-    with open("game_stats.csv", "w") as f:
-        writer = csv.writer(f)
-        writer.writerow(game_data.keys())
+    """Append game stats to the game stats store"""
 
-        # Convert all values to lists to ensure they are iterable
-        iterable_values = [
-            value if isinstance(value, (list, tuple)) else [value]
-            for value in game_data.values()
-        ]
-
-        writer.writerows(zip(*iterable_values))
-    print("Game stats saved to game_stats.csv")
+    game_stats_store.append([game_data])
+    print(f"Game stats appended to {game_stats_store.base_dir}")
 
 
 @flow(log_prints=True)
 def assemble_game_stats(team_id: int = 120):
     """Get and print game stats for most recent Nationals game"""
-    most_recent_game = get_team_most_recent_game(team_id)
-    game_data = get_game_data(most_recent_game)
+    most_recent_game = get_nationals_most_recent_game(team_id)
+    # The tasks below are cached on the game, so they only run for a new game
+    game_data_state = get_game_data(most_recent_game, team_id, return_state=True)
+    game_data = game_data_state.result()
     print_batting_stats(game_data)
     save_game_stats(game_data)
+
+    # Record an unchanged run, so operators can count the skipped work
+    if game_data_state.name == "Cached":
+        message = f"Game {game_data['game_id']} was already processed"
+        print(f"{message}, nothing to do")
+        return Completed(name="Unchanged", message=message)
     return
 
 
@@ -0,0 +1,157 @@
+# A trimmed copy of 04_retries_for_resiliency/circuit_breaker.py with only what
+# the MLB API calls use, since the chapters do not import from each other
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+import httpx
+from prefect.exceptions import MissingContextError
+from prefect.logging import get_run_logger
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# The host could not be reached or did not answer in time
+TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+def get_logger() -> logging.Logger | logging.LoggerAdapter:
+    """Log to the flow or task run when there is one, so the events show in the UI."""
+    try:
+        return get_run_logger()
+    except MissingContextError:
+        return logging.getLogger(__name__)
+
+
+def is_host_failure(exc: Exception) -> bool:
+    """True for transport errors and 5xx or 429 responses, which say the host is unwell."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code == 429 or status_code >= 500
+    return isinstance(exc, TRANSPORT_ERRORS)
+
+
+class CircuitBreaker:
+    """A circuit breaker per upstream host, with its state kept in a local SQLite file.
+
+    Because the state is on disk, every task run and flow run on the machine
+    shares it: after failure_threshold consecutive failures the circuit opens
+    and calls fail fast with CircuitOpenError. Once reset_timeout seconds have
+    passed, a single caller is let through as a half-open probe; if it
+    succeeds the circuit closes, otherwise it opens again.
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/circuit_breakers.sqlite",
+        failure_threshold: int = 5,
+        reset_timeout: float = 300,
+    ):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block as one write transaction, so concurrent runs see consistent state."""
+        # Created on first use, so a module-level breaker follows the working directory
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=30)) as db:
+            db.isolation_level = None
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS circuits (host TEXT PRIMARY KEY, "
+                    "state TEXT, failures INTEGER, opened_at REAL, "
+                    "probe_started_at REAL)"
+                )
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def _read(self, db: sqlite3.Connection, host: str) -> tuple[str, int, float, float]:
+        row = db.execute(
+            "SELECT state, failures, opened_at, probe_started_at FROM circuits "
+            "WHERE host = ?",
+            (host,),
+        ).fetchone()
+        return row or (CLOSED, 0, 0.0, 0.0)
+
+    def _write(self, db, host, state, failures, opened_at=0.0, probe_started_at=0.0):
+        db.execute(
+            "INSERT OR REPLACE INTO circuits VALUES (?, ?, ?, ?, ?)",
+            (host, state, failures, opened_at, probe_started_at),
+        )
+
+    def before_call(self, host: str):
+        """Raise CircuitOpenError unless the host may be called right now."""
+        now = time.time()
+        with self._transaction() as db:
+            state, failures, opened_at, probe_started_at = self._read(db, host)
+            if state == CLOSED:
+                return
+            if state == OPEN and now - opened_at >= self.reset_timeout:
+                self._write(db, host, HALF_OPEN, failures, opened_at, now)
+                get_logger().warning(
+                    f"Circuit for {host} is half-open, sending a probe"
+                )
+                return
+            if state == HALF_OPEN and now - probe_started_at >= self.reset_timeout:
+                # The last probe never reported back, so let another one through
+                self._write(db, host, HALF_OPEN, failures, opened_at, now)
+                return
+        retry_in = max(0, self.reset_timeout - (now - opened_at))
+        get_logger().warning(
+            f"Circuit for {host} is {state}, failing fast (next probe in {retry_in:.0f}s)"
+        )
+        raise CircuitOpenError(f"Circuit for {host} is {state}")
+
+    def record_success(self, host: str):
+        with self._transaction() as db:
+            state = self._read(db, host)[0]
+            self._write(db, host, CLOSED, 0)
+        if state != CLOSED:
+            get_logger().info(f"Circuit for {host} closed again")
+
+    def record_failure(self, host: str):
+        now = time.time()
+        with self._transaction() as db:
+            state, failures, opened_at, _ = self._read(db, host)
+            failures += 1
+            if state == HALF_OPEN or failures >= self.failure_threshold:
+                self._write(db, host, OPEN, failures, now)
+                opened = True
+            else:
+                self._write(db, host, state, failures, opened_at)
+                opened = False
+        if opened:
+            get_logger().error(
+                f"Circuit for {host} opened after {failures} failure(s); "
+                f"calls will fail fast for {self.reset_timeout:.0f}s"
+            )
+
+    @contextmanager
+    def guard(self, host: str) -> Iterator[None]:
+        """Wrap a call to host: fail fast while open and record how the call went.
+
+        Only the errors is_host_failure picks out count against the host. Any
+        other error, such as a 404, means the host answered, so it counts as a
+        success.
+        """
+        self.before_call(host)
+        try:
+            yield
+        except Exception as exc:
+            if is_host_failure(exc):
+                self.record_failure(host)
+            else:
+                self.record_success(host)
+            raise
+        self.record_success(host)
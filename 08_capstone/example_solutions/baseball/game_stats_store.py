@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import uuid
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCHEMA = pa.schema(
+    [
+        ("game_id", pa.int64()),
+        ("team", pa.string()),
+        ("date", pa.string()),
+        ("game_date", pa.string()),
+        ("opponent", pa.string()),
+        ("status", pa.string()),
+        ("score", pa.string()),
+        ("result", pa.string()),
+        ("runs", pa.int64()),
+        ("hits", pa.int64()),
+        ("home_runs", pa.int64()),
+        ("stats_error", pa.string()),
+    ]
+)
+
+
+def to_row(game_data: dict) -> dict:
+    """One store row from a game stats dictionary, with the batting stats as columns."""
+    batting = game_data.get("team_batting", game_data)
+    return {
+        "game_id": game_data["game_id"],
+        "team": game_data["team"],
+        # gameDate is the UTC start time, so a late game can fall on the next day
+        "date": game_data.get("official_date") or game_data["date"][:10],
+        "game_date": game_data["date"],
+        "opponent": game_data["opponent"],
+        "status": game_data["status"],
+        "score": game_data["score"],
+        "result": game_data["result"],
+        "runs": batting.get("runs"),
+        "hits": batting.get("hits"),
+        "home_runs": batting.get("home_runs"),
+        "stats_error": game_data.get("stats_error"),
+    }
+
+
+class GameStatsStore:
+    """Append-only Parquet store of game stats, one row per game and team.
+
+    Every append writes a new small segment file and never rewrites old ones.
+    A SQLite index maps each (game_id, team) to the segment holding its
+    latest row, so appending a game again replaces it, and the index on
+    (team, date) answers range queries by opening only the segments that
+    hold matching rows. Once there are compact_after segments, compaction
+    rewrites the live rows into one segment sorted by team and date.
+    """
+
+    def __init__(self, base_dir: str = "./data/game_stats", compact_after: int = 32):
+        self.base_dir = base_dir
+        self.compact_after = compact_after
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the index and commit the changes made in the block as one transaction."""
+        # Created on first use, so a module-level store follows the working directory
+        os.makedirs(os.path.join(self.base_dir, "segments"), exist_ok=True)
+        path = os.path.join(self.base_dir, "index.sqlite")
+        with closing(sqlite3.connect(path, timeout=30)) as db:
+            with db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS games (game_id INTEGER, team TEXT, "
+                    "date TEXT, segment TEXT, PRIMARY KEY (game_id, team))"
+                )
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS games_by_team_date ON games (team, date)"
+                )
+                yield db
+
+    def _path(self, segment: str) -> str:
+        return os.path.join(self.base_dir, "segments", segment)
+
+    def _write_segment(self, df: pd.DataFrame) -> str:
+        segment = f"{uuid.uuid4().hex}.parquet"
+        os.makedirs(os.path.join(self.base_dir, "segments"), exist_ok=True)
+        table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+        pq.write_table(table, f"{self._path(segment)}.tmp", compression="zstd")
+        os.replace(f"{self._path(segment)}.tmp", self._path(segment))
+        return segment
+
+    def append(self, game_stats: list[dict]):
+        """Append game stats; a (game_id, team) seen before is replaced by the new row."""
+        if not game_stats:
+            return
+        df = pd.DataFrame([to_row(game_data) for game_data in game_stats])
+        df = df.drop_duplicates(["game_id", "team"], keep="last")
+        keys = [
+            (int(game_id), team) for game_id, team in zip(df["game_id"], df["team"])
+        ]
+        segment = self._write_segment(df)
+        with self._connect() as db:
+            replaced = {
+                row[0]
+                for key in keys
+                for row in db.execute(
+                    "SELECT segment FROM games WHERE game_id = ? AND team = ?", key
+                )
+            }
+            db.executemany(
+                "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?)",
+                [
+                    (game_id, team, game_date, segment)
+                    for (game_id, team), game_date in zip(keys, df["date"])
+                ],
+            )
+            # A segment whose rows were all replaced is not needed any more
+            unused = [
+                old_segment
+                for old_segment in replaced
+                if db.execute(
+                    "SELECT 1 FROM games WHERE segment = ? LIMIT 1", (old_segment,)
+                ).fetchone()
+                is None
+            ]
+            (segments,) = db.execute(
+                "SELECT COUNT(DISTINCT segment) FROM games"
+            ).fetchone()
+        for old_segment in unused:
+            os.remove(self._path(old_segment))
+        if segments >= self.compact_after:
+            self.compact()
+
+    def _read_rows(self, rows: list[tuple[str, int, str]]) -> pd.DataFrame:
+        """Read (segment, game_id, team) rows, opening each segment once."""
+        by_segment = defaultdict(set)
+        for segment, game_id, team in rows:
+            by_segment[segment].add((game_id, team))
+        dfs = []
+        for segment, keys in by_segment.items():
+            game_ids = sorted({game_id for game_id, _ in keys})
+            df = pq.read_table(
+                self._path(segment), filters=[("game_id", "in", game_ids)]
+            ).to_pandas()
+            in_keys = [key in keys for key in zip(df["game_id"], df["team"])]
+            dfs.append(df[in_keys])
+        if not dfs:
+            return SCHEMA.empty_table().to_pandas()
+        return pd.concat(dfs, ignore_index=True)
+
+    def read(
+        self,
+        team: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> pd.DataFrame:
+        """Games of a team (or every team) with start_date <= date <= end_date."""
+        conditions, params = [], []
+        if team is not None:
+            conditions.append("team = ?")
+            params.append(team)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT segment, game_id, team FROM games {where}", params
+            ).fetchall()
+        df = self._read_rows(rows)
+        return df.sort_values(["date", "team"], ignore_index=True)
+
+    def compact(self):
+        """Merge every segment into one, dropping the rows that were replaced."""
+        with self._connect() as db:
+            # Hold the write lock, so no append lands between the read and the swap
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute("SELECT segment, game_id, team FROM games").fetchall()
+            old_segments = {segment for segment, _, _ in rows}
+            if len(old_segments) <= 1:
+                return
+            df = self._read_rows(rows).sort_values(["team", "date"], ignore_index=True)
+            segment = self._write_segment(df)
+            db.execute("UPDATE games SET segment = ?", (segment,))
+        for old_segment in old_segments:
+            os.remove(self._path(old_segment))
@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from contextlib import closing, contextmanager
+
+
+class PayloadCache:
+    """Compressed, content-addressed cache of MLB game payloads, keyed on gamePk.
+
+    Each payload is stored once, gzipped, under the SHA-256 of its JSON, and
+    an index maps (kind, gamePk) to that digest. A payload stored for a Final
+    game will never change, so it never expires and is never evicted. Payloads
+    of games that are not Final yet expire after ttl_seconds, and the least
+    recently used of them are evicted once they take more than max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/payload_cache",
+        max_bytes: int = 50 * 1024 * 1024,
+        ttl_seconds: int = 60,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the index and commit the changes made in the block as one transaction."""
+        # Created on first use, so a module-level cache follows the working directory
+        os.makedirs(os.path.join(self.cache_dir, "objects"), exist_ok=True)
+        path = os.path.join(self.cache_dir, "index.sqlite")
+        with closing(sqlite3.connect(path, timeout=30)) as db:
+            with db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS entries (kind TEXT, game_pk INTEGER, "
+                    "digest TEXT, final INTEGER, size INTEGER, accessed_at REAL, "
+                    "expires_at REAL, PRIMARY KEY (kind, game_pk))"
+                )
+                yield db
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", f"{digest}.json.gz")
+
+    def get(self, kind: str, game_pk: int) -> dict | None:
+        """Return the cached payload, or None on a miss or an expired entry."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT digest, expires_at FROM entries WHERE kind = ? AND game_pk = ?",
+                (kind, game_pk),
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                return None
+            digest = row[0]
+            if not os.path.exists(self._path(digest)):
+                return None
+            db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE kind = ? AND game_pk = ?",
+                (time.time(), kind, game_pk),
+            )
+        with gzip.open(self._path(digest), "rb") as f:
+            return json.loads(f.read())
+
+    def put(self, kind: str, game_pk: int, payload: dict, final: bool):
+        """Store a payload; payloads of games that are not Final are size-bounded."""
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            with open(f"{path}.tmp-{os.getpid()}", "wb") as f:
+                f.write(gzip.compress(data))
+            os.replace(f"{path}.tmp-{os.getpid()}", path)
+
+        expires_at = None if final else time.time() + self.ttl_seconds
+        with self._connect() as db:
+            previous = db.execute(
+                "SELECT digest FROM entries WHERE kind = ? AND game_pk = ?",
+                (kind, game_pk),
+            ).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    game_pk,
+                    digest,
+                    final,
+                    os.path.getsize(path),
+                    time.time(),
+                    expires_at,
+                ),
+            )
+            if previous and previous[0] != digest:
+                self._remove_unreferenced(db, previous[0])
+            self._evict(db)
+
+    def get_or_fetch(
+        self, kind: str, game_pk: int, final: bool, fetch: Callable[[], dict]
+    ) -> dict:
+        """Return the cached payload, calling fetch and storing its result on a miss."""
+        payload = self.get(kind, game_pk)
+        if payload is None:
+            payload = fetch()
+            self.put(kind, game_pk, payload, final)
+        return payload
+
+    def _remove_unreferenced(self, db: sqlite3.Connection, digest: str):
+        """Delete a stored payload once no entry points to it."""
+        (references,) = db.execute(
+            "SELECT COUNT(*) FROM entries WHERE digest = ?", (digest,)
+        ).fetchone()
+        if references == 0 and os.path.exists(self._path(digest)):
+            os.remove(self._path(digest))
+
+    def _evict(self, db: sqlite3.Connection):
+        """Remove the least recently used non-final entries over max_bytes."""
+        (total,) = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE NOT final"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        for kind, game_pk, digest, size in db.execute(
+            "SELECT kind, game_pk, digest, size FROM entries WHERE NOT final "
+            "ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute(
+                "DELETE FROM entries WHERE kind = ? AND game_pk = ?", (kind, game_pk)
+            )
+            self._remove_unreferenced(db, digest)
+            total -= size
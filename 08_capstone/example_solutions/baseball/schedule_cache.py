@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import closing, contextmanager
+from datetime import date, timedelta
+import httpx
+
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+
+
+def schedule_params(team_id: int, start_date: str, end_date: str) -> dict:
+    """Query parameters for a team's regular season and postseason schedule."""
+    return {
+        "teamId": team_id,
+        "sportId": 1,  # MLB
+        "startDate": start_date,
+        "endDate": end_date,
+        "gameType": ["R", "P"],  # Regular season & postseason games
+    }
+
+
+def fetch_schedule_dates(team_id: int, start_date: str, end_date: str) -> list[dict]:
+    """Download a team's schedule between two dates."""
+    params = schedule_params(team_id, start_date, end_date)
+    schedule_response = httpx.get(url=SCHEDULE_URL, params=params)
+    schedule_response.raise_for_status()
+    return schedule_response.json().get("dates", [])
+
+
+def is_final(game: dict) -> bool:
+    return game["status"]["abstractGameState"] == "Final"
+
+
+class ScheduleCache:
+    """Persisted team schedules that only re-request the dates that can still change.
+
+    A date whose games are all Final will not change any more, so it is kept
+    forever. Each team has a watermark, settled_through, below which every
+    date is settled; a refresh only asks the API for the dates after it. The
+    watermark never lags today by more than refresh_days, so a suspended game
+    cannot hold the whole trailing window open. Dates are stored by date, and
+    the date of the most recent Final game is kept up to date on every
+    refresh, so finding that game is a primary key lookup instead of a sort.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/schedule_cache",
+        refresh_days: int = 7,
+        fetch: Callable[[int, str, str], list[dict]] = fetch_schedule_dates,
+    ):
+        self.cache_dir = cache_dir
+        self.refresh_days = refresh_days
+        self.fetch = fetch
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the cache and commit the changes made in the block as one transaction."""
+        # Created on first use, so a module-level cache follows the working directory
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, "schedule.sqlite")
+        with closing(sqlite3.connect(path, timeout=30)) as db:
+            with db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS dates (team_id INTEGER, date TEXT, "
+                    "games TEXT, PRIMARY KEY (team_id, date))"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS teams (team_id INTEGER PRIMARY KEY, "
+                    "start_date TEXT, settled_through TEXT, latest_final_date TEXT)"
+                )
+                yield db
+
+    def _team_state(self, team_id: int, start_date: str) -> tuple[str, str] | None:
+        """(settled_through, latest_final_date), or None for a new team or season start."""
+        with self._connect() as db:
+            return db.execute(
+                "SELECT settled_through, latest_final_date FROM teams "
+                "WHERE team_id = ? AND start_date = ?",
+                (team_id, start_date),
+            ).fetchone()
+
+    def pending_range(
+        self, team_id: int, start_date: str, today: date | None = None
+    ) -> tuple[str, str]:
+        """The (startDate, endDate) to request: the dates after the team's watermark."""
+        today = today or date.today()
+        settled_through, _ = self._team_state(team_id, start_date) or (None, None)
+        fetch_start = start_date
+        if settled_through:
+            next_day = date.fromisoformat(settled_through) + timedelta(days=1)
+            fetch_start = max(start_date, next_day.isoformat())
+        return fetch_start, today.isoformat()
+
+    def merge(
+        self,
+        team_id: int,
+        start_date: str,
+        fetched: list[dict],
+        today: date | None = None,
+    ):
+        """Store the dates fetched for pending_range and move the watermark."""
+        today = today or date.today()
+        state = self._team_state(team_id, start_date)
+        settled_through, latest_final_date = state or (None, None)
+        fetched = sorted(fetched, key=lambda date_data: date_data["date"])
+
+        # The watermark stops the day before the first date with an unfinished
+        # game, and before today, which may still get games
+        settled = today - timedelta(days=1)
+        for date_data in fetched:
+            if not all(is_final(game) for game in date_data["games"]):
+                first_open = date.fromisoformat(date_data["date"])
+                settled = min(settled, first_open - timedelta(days=1))
+                break
+        oldest_allowed = today - timedelta(days=self.refresh_days)
+        new_settled = max(settled, oldest_allowed).isoformat()
+        new_settled = max(new_settled, settled_through or "")
+
+        for date_data in fetched:
+            if any(is_final(game) for game in date_data["games"]):
+                latest_final_date = max(latest_final_date or "", date_data["date"])
+
+        with self._connect() as db:
+            if state is None:
+                db.execute("DELETE FROM dates WHERE team_id = ?", (team_id,))
+            db.executemany(
+                "INSERT OR REPLACE INTO dates VALUES (?, ?, ?)",
+                [
+                    (team_id, date_data["date"], json.dumps(date_data["games"]))
+                    for date_data in fetched
+                ],
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?)",
+                (team_id, start_date, new_settled, latest_final_date),
+            )
+
+    def refresh(self, team_id: int, start_date: str, today: date | None = None) -> int:
+        """Fetch the dates after the team's watermark and merge them in.
+
+        Returns the number of dates the API sent back.
+        """
+        fetched = self.fetch(team_id, *self.pending_range(team_id, start_date, today))
+        self.merge(team_id, start_date, fetched, today)
+        return len(fetched)
+
+    def games_on(self, team_id: int, game_date: str) -> list[dict]:
+        """The cached games of a team on one date."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT games FROM dates WHERE team_id = ? AND date = ?",
+                (team_id, game_date),
+            ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def latest_final_game(self, team_id: int) -> dict | None:
+        """The team's most recent Final game in the cache, without refreshing it."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT latest_final_date FROM teams WHERE team_id = ?", (team_id,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        # The first Final game on the date, as the full-schedule scan picked it
+        for game in self.games_on(team_id, row[0]):
+            if is_final(game):
+                return game
+        return None
+
+    def most_recent_final_game(
+        self, team_id: int, start_date: str, today: date | None = None
+    ) -> dict | None:
+        """Refresh the schedule, then return the team's most recent Final game."""
+        self.refresh(team_id, start_date, today)
+        return self.latest_final_game(team_id)
@@ -1,56 +1,36 @@
-import csv
 import httpx
 from datetime import datetime
+from circuit_breaker import CircuitBreaker
+from game_stats_store import GameStatsStore
+from payload_cache import PayloadCache
+from schedule_cache import ScheduleCache, fetch_schedule_dates, is_final
 
+MLB_HOST = "statsapi.mlb.com"
+SEASON_START = "2024-01-01"
+# Shared by every run on the machine, so an MLB API outage fails fast
+breaker = CircuitBreaker(failure_threshold=3, reset_timeout=120)
 
-def get_nationals_most_recent_game():
-    """Get stats for the most recent Washington Nationals game"""
-
-    today = datetime.now()
-
-    # Get the current season schedule
-    schedule_url = "https://statsapi.mlb.com/api/v1/schedule"
-    schedule_params = {
-        "teamId": 120,  # Washington Nationals team ID
-        "sportId": 1,  # MLB
-        "startDate": "2024-01-01",
-        "endDate": today.strftime("%Y-%m-%d"),
-        "gameType": [
-            "R",
-            "P",
-        ],  # Regular season & postseason games
-    }
 
-    schedule_response = httpx.get(url=schedule_url, params=schedule_params)
-    schedule_data = schedule_response.json()
+def guarded_fetch_schedule_dates(
+    team_id: int, start_date: str, end_date: str
+) -> list[dict]:
+    """Download a team's schedule through the MLB API circuit breaker."""
+    with breaker.guard(MLB_HOST):
+        return fetch_schedule_dates(team_id, start_date, end_date)
 
-    # Find the most recent completed game
-    most_recent_game = None
-    most_recent_date = None
 
-    if "dates" in schedule_data:
-        # Sort dates in reverse chronological order
-        sorted_dates = sorted(
-            schedule_data["dates"], key=lambda x: x["date"], reverse=True
-        )
+schedule_cache = ScheduleCache(fetch=guarded_fetch_schedule_dates)
+payload_cache = PayloadCache()
+game_stats_store = GameStatsStore()
 
-        for date_data in sorted_dates:
-            for game in date_data["games"]:
-                # Check if the game is completed
-                if game["status"]["abstractGameState"] == "Final":
-                    game_date = datetime.strptime(date_data["date"], "%Y-%m-%d")
 
-                    # If we haven't found a game yet, or the current one is more recent
-                    if most_recent_date is None or game_date > most_recent_date:
-                        most_recent_game = game
-                        most_recent_date = game_date
-
-                        # Since we're already sorted, the first Final game we find is most recent
-                        break
+def get_nationals_most_recent_game():
+    """Get stats for the most recent Washington Nationals game"""
 
-            # If we found a game on this date, we're done
-            if most_recent_game:
-                break
+    # Only the dates after the last fully Final one are requested again
+    most_recent_game = schedule_cache.most_recent_final_game(
+        120, SEASON_START  # Washington Nationals team ID
+    )
 
     # If no completed games found
     if not most_recent_game:
@@ -64,10 +44,19 @@ def get_game_data(most_recent_game: dict, most_recent_date: datetime) -> dict:
 
     game_id = most_recent_game["gamePk"]
 
-    # Get detailed box score stats
+    # Get detailed box score stats; a Final game's box score is only fetched once
     boxscore_url = f"https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
-    boxscore_response = httpx.get(url=boxscore_url)
-    boxscore = boxscore_response.json()
+
+    def fetch_boxscore() -> dict:
+        with breaker.guard(MLB_HOST):
+            boxscore_response = httpx.get(url=boxscore_url)
+            # An error body must not be cached as the box score of a Final game
+            boxscore_response.raise_for_status()
+        return boxscore_response.json()
+
+    boxscore = payload_cache.get_or_fetch(
+        "boxscore", game_id, is_final(most_recent_game), fetch_boxscore
+    )
 
     # Determine if Nationals are home or away
     is_home = most_recent_game["teams"]["home"]["team"]["id"] == 120
@@ -77,7 +66,9 @@ def get_game_data(most_recent_game: dict, most_recent_date: datetime) -> dict:
     # Store basic game info in a dictionary
     result = {
         "game_id": game_id,
+        "team": most_recent_game["teams"][nats_side]["team"]["name"],
         "date": most_recent_game["gameDate"],
+        "official_date": most_recent_game.get("officialDate"),
         "opponent": most_recent_game["teams"][opponent_side]["team"]["name"],
         "status": most_recent_game["status"]["detailedState"],
         "score": f"Nationals {most_recent_game['teams'][nats_side]['score']} - {most_recent_game['teams'][opponent_side]['team']['name']} {most_recent_game['teams'][opponent_side]['score']}",
@@ -120,19 +111,9 @@ def print_batting_stats(stats):
 
 
 def save_game_stats(game_data: dict):
-    """Save game stats to a CSV file"""
-
-    with open("game_stats.csv", "w") as f:
-        writer = csv.writer(f)
-        writer.writerow(game_data.keys())
-
-        # Convert all values to lists to ensure they are iterable
-        iterable_values = [
-            value if isinstance(value, (list, tuple)) else [value]
-            for value in game_data.values()
-        ]
+    """Append game stats to the game stats store"""
 
-        writer.writerows(zip(*iterable_values))
+    game_stats_store.append([game_data])
 
 
 def assemble_game_stats():
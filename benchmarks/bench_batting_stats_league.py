@@ -0,0 +1,62 @@
+"""Compare the league-wide batting stats flow with one single-team run per team."""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from common import load_course_module
+from fake_providers import MLB_TEAM_IDS, FakeProviders
+from run_benchmarks import warm_up, working_directory
+
+single_team = load_course_module(
+    "08_capstone/example_solutions/baseball/batting_stats_prefect.py"
+)
+league = load_course_module(
+    "08_capstone/example_solutions/baseball/batting_stats_all_teams.py"
+)
+
+
+def time_sequential(providers: FakeProviders) -> float:
+    """Run assemble_game_stats once per team, one after the other."""
+    start = time.perf_counter()
+    for team_id in MLB_TEAM_IDS:
+        single_team.assemble_game_stats(team_id)
+    return time.perf_counter() - start
+
+
+def time_league(providers: FakeProviders, max_concurrency: int) -> float:
+    """Run assemble_league_game_stats once for every team."""
+    start = time.perf_counter()
+    asyncio.run(league.assemble_league_game_stats(max_concurrency))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="seconds added to every request"
+    )
+    parser.add_argument("--max-concurrency", type=int, nargs="+", default=[1, 8, 30])
+    args = parser.parse_args()
+
+    warm_up()
+    runs = [("30 sequential runs", time_sequential)]
+    for max_concurrency in args.max_concurrency:
+        runs.append(
+            (
+                f"league, {max_concurrency} concurrent",
+                lambda providers, n=max_concurrency: time_league(providers, n),
+            )
+        )
+
+    print(f"{len(MLB_TEAM_IDS)} teams, {args.latency * 1000:.0f} ms per request")
+    for name, run in runs:
+        # Every variant starts from an empty schedule cache
+        with tempfile.TemporaryDirectory() as workdir, working_directory(workdir):
+            with FakeProviders(latency=args.latency).patched() as providers:
+                elapsed = run(providers)
+        print(f"    {name:<28} {elapsed:7.2f}s  {providers.requests:4d} requests")
+
+
+if __name__ == "__main__":
+    main()
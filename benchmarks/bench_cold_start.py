@@ -0,0 +1,63 @@
+"""Time the cold start of course scripts, eager imports vs lazy, against a budget."""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from import_profile import import_code
+
+# name -> (eager script, lazy script)
+PAIRS = {
+    "stock_data": (
+        "03_start_observing/stock_data_flow_tasks.py",
+        "03_start_observing/stock_data_flow_tasks_lazy.py",
+    ),
+}
+
+
+def cold_start(code: str, repeat: int) -> float:
+    """Median wall time of running code in a fresh interpreter."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=2.0,
+        help="seconds a lazy script may take to import, interpreter start included",
+    )
+    args = parser.parse_args()
+
+    # Every run pays for the interpreter and for prefect, whatever the script does
+    interpreter = cold_start("pass", args.repeat)
+    prefect_only = cold_start("from prefect import flow, task", args.repeat)
+    print(f"{'python -c pass':<32} {interpreter:7.3f}s")
+    print(f"{'from prefect import flow, task':<32} {prefect_only:7.3f}s")
+
+    over_budget = []
+    for name, (eager, lazy) in PAIRS.items():
+        eager_time = cold_start(import_code(eager), args.repeat)
+        lazy_time = cold_start(import_code(lazy), args.repeat)
+        print(
+            f"{name:<32} eager {eager_time:7.3f}s  lazy {lazy_time:7.3f}s  "
+            f"saved {eager_time - lazy_time:6.3f}s"
+        )
+        if lazy_time > args.budget:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"Over the {args.budget}s budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Check the incremental indicators against a full recompute, then time a daily run of each."""
+
+import argparse
+import json
+import numpy as np
+import pandas as pd
+from common import load_course_module, make_stock_frame
+from bench_indicators import time_call
+
+flow_module = load_course_module(
+    "06_schedule_workflows/stock_data_deploy_schedule_cron_incremental.py"
+)
+
+SMA_WINDOWS = [3, 20, 50]
+EMA_WINDOWS = [12, 26]
+
+
+def full_recompute(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """Transform every row from an empty state, as a run without saved state does."""
+    df, _, incremental = flow_module.transform_stock_data.fn(
+        df_raw, df_raw, None, SMA_WINDOWS, EMA_WINDOWS
+    )
+    assert not incremental
+    return df
+
+
+def incremental_runs(df_raw: pd.DataFrame, splits: list[int]) -> pd.DataFrame:
+    """Transform the rows in one run per split, saving and loading the state between runs."""
+    frames, state = [], None
+    for start, end in zip([0, *splits], [*splits, len(df_raw)]):
+        df, state, incremental = flow_module.transform_stock_data.fn(
+            df_raw.iloc[:end], df_raw.iloc[start:end], state, SMA_WINDOWS, EMA_WINDOWS
+        )
+        assert incremental == (start > 0)
+        frames.append(df)
+        # The flow keeps the state in JSON between runs
+        state = json.loads(json.dumps(state))
+    return pd.concat(frames)
+
+
+def pandas_reference(close: pd.Series) -> pd.DataFrame:
+    """The same indicators computed with pandas rolling() and ewm()."""
+    columns = {
+        f"SMA {window} Close": close.rolling(window).mean() for window in SMA_WINDOWS
+    }
+    columns.update(
+        {
+            f"EMA {window} Close": close.ewm(span=window, adjust=False).mean()
+            for window in EMA_WINDOWS
+        }
+    )
+    return pd.DataFrame(columns)
+
+
+def check_equivalence(df_raw: pd.DataFrame, runs: int, seed: int):
+    """Assert that incremental runs match a full recompute exactly."""
+    ticker = df_raw.columns.get_level_values(1)[0]
+    expected = full_recompute(df_raw)
+
+    # Close to pandas on every row, missing closes included
+    reference = pandas_reference(df_raw[("Close", ticker)])
+    np.testing.assert_allclose(
+        expected.loc[:, (list(reference.columns), ticker)].to_numpy(),
+        reference.to_numpy(),
+        rtol=1e-9,
+        equal_nan=True,
+    )
+
+    rng = np.random.default_rng(seed)
+    split_sets = {
+        "one row per run": list(range(1, len(df_raw))),
+        f"{runs} random runs": sorted(
+            rng.choice(np.arange(1, len(df_raw)), runs - 1, replace=False).tolist()
+        ),
+    }
+    for name, splits in split_sets.items():
+        actual = incremental_runs(df_raw, splits)
+        # Bit-for-bit, so appended rows never drift from a rewrite of the file
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+        print(f"    {name:<18} identical to the full recompute")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start-date", default="2015-01-01")
+    parser.add_argument("--end-date", default="2025-01-01")
+    parser.add_argument("--check-days", type=int, default=400)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df_raw = make_stock_frame(["AAPL"], args.start_date, args.end_date)
+    # Missing closes, as yfinance returns for halted days
+    df_raw.iloc[[30, 31, 200], df_raw.columns.get_loc(("Close", "AAPL"))] = np.nan
+
+    print(f"Equivalence over {args.check_days} days:")
+    check_equivalence(df_raw.iloc[: args.check_days], args.runs, seed=0)
+
+    # A daily run: every earlier row is stored, the last one is new
+    _, state, _ = flow_module.transform_stock_data.fn(
+        df_raw.iloc[:-1], df_raw.iloc[:-1], None, SMA_WINDOWS, EMA_WINDOWS
+    )
+    full = time_call(lambda: full_recompute(df_raw), args.repeat)
+    incremental = time_call(
+        lambda: flow_module.transform_stock_data.fn(
+            df_raw, df_raw.iloc[-1:], state, SMA_WINDOWS, EMA_WINDOWS
+        ),
+        args.repeat,
+    )
+    print(
+        f"Daily run over {len(df_raw)} days: full {full:.4f}s, "
+        f"incremental {incremental:.4f}s, {full / incremental:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
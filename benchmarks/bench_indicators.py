@@ -0,0 +1,91 @@
+"""Benchmark the vectorized indicator engine against per-ticker pandas code."""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from common import load_course_module, make_stock_frame, make_tickers
+
+indicators_module = load_course_module("03_start_observing/stock_data_indicators.py")
+
+
+def per_ticker_indicators(
+    df: pd.DataFrame, indicators: dict[str, list[int]]
+) -> pd.DataFrame:
+    """The existing approach: one frame and one set of pandas calls per ticker."""
+    frames = []
+    for ticker in df.columns.get_level_values(1).unique():
+        df_ticker = df.xs(ticker, axis=1, level=1, drop_level=False)
+        close = df_ticker[("Close", ticker)]
+        for window in indicators.get("sma", []):
+            df_ticker[(f"SMA {window} Close", ticker)] = close.rolling(window).mean()
+        for window in indicators.get("ema", []):
+            df_ticker[(f"EMA {window} Close", ticker)] = close.ewm(
+                span=window, adjust=False
+            ).mean()
+        for window in indicators.get("volatility", []):
+            df_ticker[(f"Volatility {window}", ticker)] = (
+                close.pct_change(fill_method=None).rolling(window).std()
+            )
+        for window in indicators.get("vwap", []):
+            volume = df_ticker[("Volume", ticker)]
+            typical_price = (
+                df_ticker[("High", ticker)] + df_ticker[("Low", ticker)] + close
+            ) / 3
+            df_ticker[(f"VWAP {window}", ticker)] = (typical_price * volume).rolling(
+                window
+            ).sum() / volume.rolling(window).sum()
+        for periods in indicators.get("returns", []):
+            df_ticker[(f"Return {periods}", ticker)] = close.pct_change(
+                periods, fill_method=None
+            )
+        frames.append(df_ticker)
+    return pd.concat(frames, axis=1)
+
+
+def time_call(fn, repeat: int) -> float:
+    """Return the best wall time of repeat calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--start-date", default="2015-01-01")
+    parser.add_argument("--end-date", default="2025-01-01")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    indicators = indicators_module.DEFAULT_INDICATORS
+    print(
+        f"{'tickers':>8} {'rows':>6} {'per-ticker s':>13} {'vectorized s':>13} {'speedup':>8}"
+    )
+    for count in args.tickers:
+        df = make_stock_frame(make_tickers(count), args.start_date, args.end_date)
+
+        expected = per_ticker_indicators(df, indicators)
+        actual = indicators_module.compute_indicators(df, indicators)
+        np.testing.assert_allclose(
+            actual[expected.columns].to_numpy(dtype="float64"),
+            expected.to_numpy(dtype="float64"),
+            rtol=1e-9,
+            atol=1e-12,
+        )
+
+        baseline = time_call(lambda: per_ticker_indicators(df, indicators), args.repeat)
+        vectorized = time_call(
+            lambda: indicators_module.compute_indicators(df, indicators), args.repeat
+        )
+        print(
+            f"{count:>8} {len(df):>6} {baseline:>13.3f} {vectorized:>13.3f}"
+            f" {baseline / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark the process-pool indicator engine from 1 to N workers against the serial one."""
+
+import argparse
+import os
+import sys
+import numpy as np
+from common import REPO_ROOT, make_stock_frame, make_tickers
+from bench_indicators import time_call
+
+# Imported by name rather than by path, so pickle finds the worker function
+# under the same module name the spawned workers import it by
+sys.path.insert(0, str(REPO_ROOT / "03_start_observing"))
+import parallel_indicators as parallel  # noqa: E402
+from stock_data_indicators import compute_indicators  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=2000)
+    parser.add_argument("--start-date", default="2015-01-01")
+    parser.add_argument("--end-date", default="2025-01-01")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_stock_frame(make_tickers(args.tickers), args.start_date, args.end_date)
+    print(f"{args.tickers} tickers x {len(df)} days, {os.cpu_count()} CPUs")
+
+    expected = compute_indicators(df)
+    serial = time_call(lambda: compute_indicators(df), args.repeat)
+    print(f"    {'serial':<10} {serial:8.3f}s")
+
+    for workers in range(1, args.max_workers + 1):
+        # The first call starts the pool, so it is not timed
+        result = parallel.compute_indicators_parallel(df, max_workers=workers)
+        assert np.allclose(
+            result.to_numpy(dtype="float64"),
+            expected.to_numpy(dtype="float64"),
+            equal_nan=True,
+        )
+        elapsed = time_call(
+            lambda: parallel.compute_indicators_parallel(df, max_workers=workers),
+            args.repeat,
+        )
+        speedup = serial / elapsed
+        print(
+            f"    {workers:>2} workers {elapsed:8.3f}s  {speedup:5.2f}x  "
+            f"efficiency {speedup / workers:4.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure what Prefect adds on top of the bare stock pipeline, per flow run and per task."""
+
+import argparse
+import tempfile
+import time
+from prefect.settings import (
+    PREFECT_LOGGING_TO_API_ENABLED,
+    PREFECT_RESULTS_PERSIST_BY_DEFAULT,
+    temporary_settings,
+)
+from common import load_course_module, make_tickers
+from fake_providers import FakeProviders
+from run_benchmarks import warm_up, working_directory
+
+bare = load_course_module("03_start_observing/stock_data_bare.py")
+flow_only = load_course_module("03_start_observing/stock_data_flow.py")
+with_tasks = load_course_module("03_start_observing/stock_data_flow_tasks.py")
+inline = load_course_module("03_start_observing/stock_data_flow_tasks_inline.py")
+
+VARIANTS = {
+    "bare": bare.fetch_and_save_stock_data,
+    "flow only": flow_only.fetch_and_save_stock_data,
+    "4 tasks": with_tasks.fetch_and_save_stock_data,
+    "2 tasks, inline saves": inline.fetch_and_save_stock_data,
+}
+
+# name -> settings applied while timing the 4-task variant
+ORCHESTRATION_SETTINGS = {
+    "states only": {
+        PREFECT_RESULTS_PERSIST_BY_DEFAULT: False,
+        PREFECT_LOGGING_TO_API_ENABLED: False,
+    },
+    "+ result persistence": {
+        PREFECT_RESULTS_PERSIST_BY_DEFAULT: True,
+        PREFECT_LOGGING_TO_API_ENABLED: False,
+    },
+    "+ API logging": {
+        PREFECT_RESULTS_PERSIST_BY_DEFAULT: True,
+        PREFECT_LOGGING_TO_API_ENABLED: True,
+    },
+}
+
+
+def time_pipeline(fn, tickers: list[str], years: int) -> float:
+    """Run the pipeline once per ticker on fake data and return the wall time."""
+    start_date, end_date = f"{2025 - years}-01-01", "2025-01-01"
+    with tempfile.TemporaryDirectory() as workdir, working_directory(workdir):
+        with FakeProviders().patched():
+            start = time.perf_counter()
+            for ticker in tickers:
+                fn(ticker, start_date, end_date)
+            return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10])
+    args = parser.parse_args()
+
+    warm_up()
+    for count in args.tickers:
+        tickers = make_tickers(count)
+        for years in args.years:
+            print(f"\n{count} tickers, {years} year(s) of daily data")
+            timings = {}
+            for name, fn in VARIANTS.items():
+                with temporary_settings(ORCHESTRATION_SETTINGS["+ API logging"]):
+                    timings[name] = time_pipeline(fn, tickers, years)
+                print(f"    {name:<24} {timings[name] / count * 1000:8.1f} ms/run")
+
+            flow_overhead = (timings["flow only"] - timings["bare"]) / count
+            task_overhead = (timings["4 tasks"] - timings["flow only"]) / (4 * count)
+            inline_saving = (
+                timings["4 tasks"] - timings["2 tasks, inline saves"]
+            ) / count
+            print(f"    flow run overhead        {flow_overhead * 1000:8.1f} ms/run")
+            print(f"    task run overhead        {task_overhead * 1000:8.1f} ms/task")
+            print(f"    saved by inline saves    {inline_saving * 1000:8.1f} ms/run")
+
+            # Attribute the task overhead to each part of the orchestration
+            with temporary_settings(ORCHESTRATION_SETTINGS["states only"]):
+                previous = time_pipeline(
+                    flow_only.fetch_and_save_stock_data, tickers, years
+                )
+            for name, settings in ORCHESTRATION_SETTINGS.items():
+                with temporary_settings(settings):
+                    elapsed = time_pipeline(
+                        with_tasks.fetch_and_save_stock_data, tickers, years
+                    )
+                added = (elapsed - previous) / (4 * count)
+                print(f"    {name:<24} {added * 1000:8.1f} ms/task")
+                previous = elapsed
+
+
+if __name__ == "__main__":
+    main()
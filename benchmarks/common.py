@@ -0,0 +1,49 @@
+import importlib.util
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_course_module(relative_path: str):
+    """Import a course script by path, since the chapter folders are not packages."""
+    path = REPO_ROOT / relative_path
+    # Course scripts import the helper modules next to them
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_stock_frame(
+    tickers: list[str], start_date: str, end_date: str, seed: int = 0
+) -> pd.DataFrame:
+    """Build a synthetic yfinance-style frame with (Price, Ticker) columns."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(
+        start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1), name="Date"
+    )
+    shape = (len(dates), len(tickers))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, shape), axis=0))
+    open_ = close * (1 + rng.normal(0, 0.005, shape))
+    high = np.maximum(close, open_) * (1 + rng.uniform(0, 0.01, shape))
+    low = np.minimum(close, open_) * (1 - rng.uniform(0, 0.01, shape))
+    volume = rng.integers(1_000_000, 50_000_000, shape)
+
+    prices = {"Close": close, "High": high, "Low": low, "Open": open_}
+    columns = pd.MultiIndex.from_product(
+        [["Close", "High", "Low", "Open", "Volume"], tickers],
+        names=["Price", "Ticker"],
+    )
+    values = np.hstack([*prices.values(), volume])
+    df = pd.DataFrame(values, index=dates, columns=columns)
+    return df.astype({("Volume", ticker): "int64" for ticker in tickers})
+
+
+def make_tickers(count: int) -> list[str]:
+    """Return count distinct fake ticker symbols."""
+    return [f"T{i:04d}" for i in range(count)]
@@ -0,0 +1,213 @@
+"""Local stand-ins for the APIs the course flows call, for offline benchmarks."""
+
+import asyncio
+import json
+import re
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from unittest import mock
+import httpx
+from httpx import AsyncClient
+import pandas as pd
+import requests
+from common import make_stock_frame
+
+# The 30 MLB team ids; neighbours in the list play each other every day
+MLB_TEAM_IDS = [*range(108, 122), *range(133, 148), 158]
+
+
+class FakeProviders:
+    """Serve synthetic yfinance, MLB Stats, football-data.org and Open-Meteo data.
+
+    size scales how much data each response carries, and latency adds a fixed
+    delay to every request. rows_served and requests count what was handed out
+    so the benchmark can report throughput.
+    """
+
+    def __init__(self, size: int = 1, latency: float = 0.0, seed: int = 0):
+        self.size = size
+        self.latency = latency
+        self.seed = seed
+        self.rows_served = 0
+        self.requests = 0
+
+    def _serve(self, rows: int):
+        self.requests += 1
+        self.rows_served += rows
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def yf_download(
+        self, tickers, start=None, end=None, period="1d", **kwargs
+    ) -> pd.DataFrame:
+        """Stand-in for yfinance.download."""
+        if isinstance(tickers, str):
+            tickers = tickers.split()
+        df = make_stock_frame(list(tickers), start, end, seed=self.seed)
+        self._serve(len(df) * len(tickers))
+        self._wait()
+        return df
+
+    def mlb_teams(self) -> dict:
+        self._serve(len(MLB_TEAM_IDS))
+        return {
+            "teams": [
+                {"id": team_id, "name": mlb_team_name(team_id)}
+                for team_id in MLB_TEAM_IDS
+            ]
+        }
+
+    def mlb_schedule(self, params: dict) -> dict:
+        """One Final game per day for the last 180 * size days, from startDate on."""
+        team_id = int(params.get("teamId", 120))
+        start = params.get("startDate", "")
+        end = date.fromisoformat(params.get("endDate", date.today().isoformat()))
+        # A team in MLB_TEAM_IDS plays its neighbour, and both see the same gamePk
+        if team_id in MLB_TEAM_IDS:
+            position = MLB_TEAM_IDS.index(team_id)
+            opponent_id = MLB_TEAM_IDS[position ^ 1]
+            pair = min(position, position ^ 1)
+        else:
+            opponent_id, pair = 999, 0
+        dates = []
+        for offset in range(180 * self.size, 0, -1):
+            game_date = end - timedelta(days=offset)
+            if game_date.isoformat() < start:
+                continue
+            home, away = min(team_id, opponent_id), max(team_id, opponent_id)
+            if offset % 2:
+                home, away = away, home
+            game_pk = 800000 + offset * 100 + pair
+            dates.append(
+                {
+                    "date": game_date.isoformat(),
+                    "games": [mlb_game(game_pk, game_date, home, away, offset)],
+                }
+            )
+        self._serve(len(dates))
+        return {"dates": dates}
+
+    def mlb_boxscore(self, game_id: int) -> dict:
+        self._serve(1)
+        batting = {"runs": game_id % 9, "hits": game_id % 13, "homeRuns": game_id % 3}
+        return {
+            "teams": {
+                side: {"teamStats": {"batting": batting}} for side in ("home", "away")
+            }
+        }
+
+    def football_standings(self) -> dict:
+        self._serve(20)
+        return {
+            "standings": [
+                {
+                    "table": [
+                        {"team": {"id": team_id}, "playedGames": 25}
+                        for team_id in range(1, 21)
+                    ]
+                }
+            ]
+        }
+
+    def football_team(self, team_id: int) -> dict:
+        players = 25 * self.size
+        self._serve(players)
+        return {
+            "id": team_id,
+            "name": f"Team {team_id}",
+            "squad": [
+                {"name": f"Player {team_id}-{i}", "assists": (team_id * i) % 15}
+                for i in range(players)
+            ],
+        }
+
+    def open_meteo(self) -> dict:
+        hours = 24 * self.size
+        self._serve(hours)
+        start = pd.Timestamp.now().floor("D")
+        times = pd.date_range(start, periods=hours, freq="h")
+        return {
+            "hourly": {
+                "time": times.strftime("%Y-%m-%dT%H:00").tolist(),
+                "temperature_2m": [60 + (i % 24) / 2 for i in range(hours)],
+            }
+        }
+
+    def route(self, url: str, params: dict | None) -> dict:
+        """Return the payload for a request URL."""
+        params = params or {}
+        if "statsapi.mlb.com" in url and url.endswith("/teams"):
+            return self.mlb_teams()
+        if "statsapi.mlb.com" in url and url.endswith("/schedule"):
+            return self.mlb_schedule(params)
+        if match := re.search(r"/game/(\d+)/boxscore", url):
+            return self.mlb_boxscore(int(match.group(1)))
+        if match := re.search(r"football-data.org/v4/competitions/\w+/standings", url):
+            return self.football_standings()
+        if match := re.search(r"football-data.org/v4/teams/(\d+)", url):
+            return self.football_team(int(match.group(1)))
+        if "ipinfo.io" in url:
+            self._serve(1)
+            return {"loc": "37.7749,-122.4194", "city": "Oakland", "region": "CA"}
+        if "open-meteo.com" in url:
+            return self.open_meteo()
+        raise ValueError(f"No fake provider for {url}")
+
+    def httpx_get(self, url, params=None, **kwargs) -> httpx.Response:
+        payload = self.route(str(url), params)
+        self._wait()
+        return httpx.Response(200, json=payload, request=httpx.Request("GET", url))
+
+    async def httpx_handle_async(self, request: httpx.Request) -> httpx.Response:
+        """Handler for httpx.AsyncClient; the latency does not block the event loop."""
+        url = str(request.url.copy_with(query=None))
+        payload = self.route(url, dict(request.url.params))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return httpx.Response(200, json=payload)
+
+    def httpx_async_client(self, *args, **kwargs) -> httpx.AsyncClient:
+        """Stand-in for httpx.AsyncClient, with the fakes as its transport."""
+        kwargs["transport"] = httpx.MockTransport(self.httpx_handle_async)
+        return AsyncClient(*args, **kwargs)
+
+    def requests_get(self, url, params=None, **kwargs) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = json.dumps(self.route(url, params)).encode()
+        self._wait()
+        return response
+
+    @contextmanager
+    def patched(self):
+        """Route yfinance, httpx and requests calls to the fakes."""
+        with (
+            mock.patch("yfinance.download", self.yf_download),
+            mock.patch("httpx.get", self.httpx_get),
+            mock.patch("httpx.AsyncClient", self.httpx_async_client),
+            mock.patch("requests.get", self.requests_get),
+        ):
+            yield self
+
+
+def mlb_team_name(team_id: int) -> str:
+    return "Washington Nationals" if team_id == 120 else f"Team {team_id}"
+
+
+def mlb_game(game_pk: int, game_date: date, home_id: int, away_id: int, seed: int):
+    """A Final game between two teams."""
+    home_score, away_score = seed % 7, (seed * 3) % 7
+    home = {"team": {"id": home_id, "name": mlb_team_name(home_id)}}
+    away = {"team": {"id": away_id, "name": mlb_team_name(away_id)}}
+    home.update(score=home_score, isWinner=home_score > away_score)
+    away.update(score=away_score, isWinner=away_score >= home_score)
+    return {
+        "gamePk": game_pk,
+        "gameDate": f"{game_date.isoformat()}T23:05:00Z",
+        "status": {"abstractGameState": "Final", "detailedState": "Final"},
+        "teams": {"home": home, "away": away},
+    }
@@ -0,0 +1,107 @@
+"""Report what importing a course script costs, per module, using python -X importtime."""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from common import REPO_ROOT
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# Imports the script the way a deployment run does, without running __main__.
+# common.load_course_module is not used because common imports pandas itself.
+IMPORT_SCRIPT = """
+import importlib.util, sys
+path = {path!r}
+sys.path.insert(0, {directory!r})
+spec = importlib.util.spec_from_file_location("course_module", path)
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+
+def import_code(relative_path: str) -> str:
+    """Python code that imports a course script in a fresh interpreter."""
+    path = REPO_ROOT / relative_path
+    return IMPORT_SCRIPT.format(path=str(path), directory=str(path.parent))
+
+
+def profile_imports(relative_path: str) -> list[tuple[str, int, float, float]]:
+    """Import the script in a fresh interpreter and parse the -X importtime output.
+
+    Returns (module, depth, self seconds, cumulative seconds) per imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", import_code(relative_path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        # One leading space, plus two per level of nesting
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append(
+            (name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6)
+        )
+    return modules
+
+
+def format_report(relative_path: str, modules, top_n: int = 15) -> str:
+    """Markdown with the total, the cost per top-level package and the slowest modules."""
+    top_level = [module for module in modules if module[1] == 0]
+    total = sum(cumulative for _, _, _, cumulative in top_level)
+    by_package = defaultdict(float)
+    for name, _, _, cumulative in top_level:
+        by_package[name.split(".")[0]] += cumulative
+
+    lines = [
+        f"# Import profile of {relative_path}",
+        "",
+        f"{len(modules)} modules imported in {total:.3f}s",
+        "",
+        "| package | cumulative s | share |",
+        "| --- | --- | --- |",
+    ]
+    for package, seconds in sorted(by_package.items(), key=lambda item: -item[1]):
+        if seconds >= 0.001:
+            lines.append(f"| {package} | {seconds:.3f} | {seconds / total:.0%} |")
+    lines += [
+        "",
+        f"Slowest {top_n} modules, cumulative:",
+        "",
+        "| module | self s | cumulative s |",
+        "| --- | --- | --- |",
+    ]
+    slowest = sorted(modules, key=lambda module: -module[3])[:top_n]
+    for name, _, self_seconds, cumulative in slowest:
+        lines.append(f"| {name} | {self_seconds:.3f} | {cumulative:.3f} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "scripts",
+        nargs="*",
+        default=[
+            "03_start_observing/stock_data_flow_tasks.py",
+            "03_start_observing/stock_data_flow_tasks_lazy.py",
+            "08_capstone/example_solutions/baseball/batting_stats_prefect.py",
+        ],
+    )
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    for relative_path in args.scripts:
+        report = format_report(relative_path, profile_imports(relative_path), args.top)
+        print(report, end="\n\n")
+        stem = relative_path.rsplit("/", 1)[-1].removesuffix(".py")
+        (RESULTS_DIR / f"import_profile_{stem}.md").write_text(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Run every course flow against the fake providers and compare with the last results."""
+
+import argparse
+import functools
+import json
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from prefect import Task, flow
+from prefect.settings import PREFECT_LOCAL_STORAGE_PATH, temporary_settings
+from common import REPO_ROOT, load_course_module
+from fake_providers import FakeProviders
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# name -> (course script, flow function, parameters for a given size)
+SCENARIOS = {
+    "stock_data": (
+        "03_start_observing/stock_data_flow_tasks.py",
+        "fetch_and_save_stock_data",
+        lambda size: {
+            "start_date": f"{2025 - 5 * size}-01-01",
+            "end_date": "2025-01-01",
+        },
+    ),
+    "batting_stats": (
+        "08_capstone/example_solutions/baseball/batting_stats_prefect.py",
+        "assemble_game_stats",
+        lambda size: {},
+    ),
+    "soccer_assists": (
+        "08_capstone/example_solutions/soccer/soccer_etl.py",
+        "soccer_assists_etl",
+        lambda size: {},
+    ),
+    "weather_forecast": (
+        "08_capstone/example_solutions/weather/combine_temp_predictions.py",
+        "weather_forecast_etl",
+        lambda size: {},
+    ),
+}
+
+
+@contextmanager
+def working_directory(path: str):
+    """Run inside path, with the data folders the course scripts write to.
+
+    Persisted task results go under path too, so cached tasks from an
+    earlier benchmark run are not reused.
+    """
+    previous = os.getcwd()
+    os.makedirs(os.path.join(path, "run", "data"))
+    os.makedirs(os.path.join(path, "data"))
+    os.chdir(os.path.join(path, "run"))
+    try:
+        storage = os.path.join(path, "storage")
+        with temporary_settings({PREFECT_LOCAL_STORAGE_PATH: storage}):
+            yield
+    finally:
+        os.chdir(previous)
+
+
+@flow
+def warm_up():
+    """An empty flow run, so the benchmarks do not time the local API server start."""
+
+
+def time_tasks(module) -> dict[str, list[float]]:
+    """Wrap every task function in the module to record its wall time."""
+    timings = defaultdict(list)
+    for task_obj in vars(module).values():
+        if not isinstance(task_obj, Task):
+            continue
+
+        def timed(*args, __fn=task_obj.fn, __name=task_obj.name, **kwargs):
+            start = time.perf_counter()
+            try:
+                return __fn(*args, **kwargs)
+            finally:
+                timings[__name].append(time.perf_counter() - start)
+
+        task_obj.fn = functools.wraps(task_obj.fn)(timed)
+    return timings
+
+
+def run_scenario(name: str, size: int, latency: float) -> dict:
+    """Run one flow against the fakes and collect its timings and memory use."""
+    script, flow_name, make_parameters = SCENARIOS[name]
+    module = load_course_module(script)
+    timings = time_tasks(module)
+    providers = FakeProviders(size=size, latency=latency)
+
+    with tempfile.TemporaryDirectory() as workdir, working_directory(workdir):
+        with providers.patched():
+            tracemalloc.start()
+            start = time.perf_counter()
+            state = getattr(module, flow_name)(
+                **make_parameters(size), return_state=True
+            )
+            wall_time = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    return {
+        "state": state.type.value,
+        "wall_time_s": wall_time,
+        "rows": providers.rows_served,
+        "rows_per_s": providers.rows_served / wall_time,
+        "requests": providers.requests,
+        "peak_memory_mb": peak_memory / 1024 / 1024,
+        "tasks": {
+            task_name: {"calls": len(durations), "wall_time_s": sum(durations)}
+            for task_name, durations in timings.items()
+        },
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=REPO_ROOT,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(
+    current: dict, previous: dict, threshold: float, min_seconds: float = 0.05
+) -> list[str]:
+    """List the flows and tasks that got slower than threshold since the last run.
+
+    Timings shorter than min_seconds are too noisy to compare and are skipped.
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before is None:
+            continue
+        pairs = [(name, before["wall_time_s"], result["wall_time_s"])]
+        for task_name, task_result in result["tasks"].items():
+            if task_name in before["tasks"]:
+                pairs.append(
+                    (
+                        f"{name}.{task_name}",
+                        before["tasks"][task_name]["wall_time_s"],
+                        task_result["wall_time_s"],
+                    )
+                )
+        for label, old, new in pairs:
+            if old > 0 and new >= min_seconds and (new - old) / old > threshold:
+                regressions.append(
+                    f"{label}: {old:.3f}s -> {new:.3f}s (+{(new - old) / old:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS))
+    parser.add_argument("--size", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "size": args.size,
+        "latency": args.latency,
+        "scenarios": {},
+    }
+    warm_up()
+    for name in args.scenarios:
+        result = run_scenario(name, args.size, args.latency)
+        report["scenarios"][name] = result
+        print(
+            f"{name}: {result['state']} in {result['wall_time_s']:.2f}s, "
+            f"{result['rows_per_s']:.0f} rows/s, peak {result['peak_memory_mb']:.1f} MB"
+        )
+        for task_name, task_result in result["tasks"].items():
+            print(
+                f"    {task_name}: {task_result['calls']} call(s), "
+                f"{task_result['wall_time_s']:.3f}s"
+            )
+
+    # Only compare runs made with the same data size and latency
+    RESULTS_DIR.mkdir(exist_ok=True)
+    previous_reports = [
+        json.loads(path.read_text()) for path in sorted(RESULTS_DIR.glob("*.json"))
+    ]
+    previous_reports = [
+        previous
+        for previous in previous_reports
+        if (previous["size"], previous["latency"]) == (args.size, args.latency)
+    ]
+    if previous_reports:
+        regressions = compare(report, previous_reports[-1], args.threshold)
+        print(f"\nCompared with {previous_reports[-1]['commit']}:")
+        for line in regressions or ["no regressions"]:
+            print(f"    {line}")
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = RESULTS_DIR / f"{timestamp}-{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
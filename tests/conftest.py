@@ -0,0 +1,66 @@
+import importlib.util
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from prefect.settings import PREFECT_LOCAL_STORAGE_PATH, temporary_settings
+from prefect.testing.utilities import prefect_test_harness
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prefect_api(tmp_path_factory):
+    """Run every flow against a throwaway API database and result store."""
+    storage = tmp_path_factory.mktemp("prefect-results")
+    with prefect_test_harness():
+        with temporary_settings({PREFECT_LOCAL_STORAGE_PATH: storage}):
+            yield
+
+
+@pytest.fixture
+def in_tmp_dir(tmp_path, monkeypatch):
+    """Run the test from an empty directory with a data folder, as the course scripts expect."""
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def course_module():
+    """Import a course script by path, since the chapter folders are not packages."""
+
+    def load(relative_path: str):
+        path = REPO_ROOT / relative_path
+        # Course scripts import the helper modules next to them
+        if str(path.parent) not in sys.path:
+            sys.path.insert(0, str(path.parent))
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
+
+
+@pytest.fixture(scope="session")
+def stock_frame():
+    """Build a synthetic yfinance-style frame with (Price, Ticker) columns."""
+
+    def make(ticker: str, start_date: str, end_date: str, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range(
+            start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1), name="Date"
+        )
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+        columns = pd.MultiIndex.from_product(
+            [["Close", "High", "Low", "Open", "Volume"], [ticker]],
+            names=["Price", "Ticker"],
+        )
+        values = np.column_stack(
+            [close, close * 1.01, close * 0.99, close, np.full(len(dates), 1e6)]
+        )
+        return pd.DataFrame(values, index=dates, columns=columns)
+
+    return make
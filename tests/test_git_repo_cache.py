@@ -0,0 +1,67 @@
+import asyncio
+import shutil
+import subprocess
+import pytest
+
+
+@pytest.fixture
+def git_repo_cache(course_module):
+    return course_module("06_schedule_workflows/git_repo_cache.py")
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """A local repository to clone from, with a helper that commits to it."""
+    path = tmp_path / "remote"
+    path.mkdir()
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=path, check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "dev")
+
+    def commit(text: str) -> str:
+        (path / "flow.py").write_text(text)
+        git("add", "flow.py")
+        git("commit", "-q", "-m", text)
+        return git("rev-parse", "HEAD")
+
+    return path.as_uri(), commit
+
+
+def test_linked_checkouts_are_never_evicted(git_repo_cache, remote, tmp_path):
+    url, commit = remote
+    cache = git_repo_cache.GitRepoCache(str(tmp_path / "cache"), max_bytes=0)
+    destination = tmp_path / "runs" / "flows"
+    destination.parent.mkdir()
+
+    first = cache.checkout(url, commit("v1"), destination=destination)
+    destination.symlink_to(first, target_is_directory=True)
+    cache.checkout(url, commit("v2"))
+    assert (first / "flow.py").read_text() == "v1"
+
+    destination.unlink()
+    cache.checkout(url, commit("v3"))
+    assert not first.exists()
+
+
+def test_pull_links_the_checkout_again_when_it_was_deleted(
+    git_repo_cache, remote, tmp_path
+):
+    url, commit = remote
+    commit("v1")
+    cache = git_repo_cache.GitRepoCache(str(tmp_path / "cache"))
+    repository = git_repo_cache.CachedGitRepository(url=url, name="flows", cache=cache)
+    repository.set_base_path(tmp_path / "runs")
+
+    asyncio.run(repository.pull_code())
+    checkout = repository.destination.resolve()
+    # As if another process evicted it
+    shutil.rmtree(checkout)
+    asyncio.run(repository.pull_code())
+
+    assert (repository.destination / "flow.py").read_text() == "v1"
@@ -0,0 +1,101 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+SMA_WINDOWS = [3, 20]
+EMA_WINDOWS = [12, 26]
+
+
+@pytest.fixture
+def incremental(course_module):
+    return course_module(
+        "06_schedule_workflows/stock_data_deploy_schedule_cron_incremental.py"
+    )
+
+
+@pytest.fixture
+def df_raw(stock_frame):
+    df = stock_frame("AAPL", "2024-01-01", "2025-01-01")
+    # Missing closes, as yfinance returns for halted days
+    df.iloc[[0, 30, 31, 100, 102], df.columns.get_loc(("Close", "AAPL"))] = np.nan
+    return df
+
+
+def transform(incremental, df_raw, df_new, state):
+    return incremental.transform_stock_data.fn(
+        df_raw, df_new, state, SMA_WINDOWS, EMA_WINDOWS
+    )
+
+
+def test_incremental_runs_match_a_full_recompute_exactly(incremental, df_raw):
+    expected, _, _ = transform(incremental, df_raw, df_raw, None)
+
+    frames, state = [], None
+    splits = [5, 30, 31, 32, 101, 150, 151]
+    for start, end in zip([0, *splits], [*splits, len(df_raw)]):
+        df, state, was_incremental = transform(
+            incremental, df_raw.iloc[:end], df_raw.iloc[start:end], state
+        )
+        assert was_incremental == (start > 0)
+        frames.append(df)
+        state = json.loads(json.dumps(state))
+
+    pd.testing.assert_frame_equal(pd.concat(frames), expected, check_exact=True)
+
+
+def test_missing_closes_follow_pandas(incremental, df_raw):
+    df, _, _ = transform(incremental, df_raw, df_raw, None)
+    close = df_raw[("Close", "AAPL")]
+
+    for window in SMA_WINDOWS:
+        np.testing.assert_allclose(
+            df[(f"SMA {window} Close", "AAPL")].to_numpy(),
+            close.rolling(window).mean().to_numpy(),
+            rtol=1e-12,
+            equal_nan=True,
+        )
+    for window in EMA_WINDOWS:
+        np.testing.assert_array_equal(
+            df[(f"EMA {window} Close", "AAPL")].to_numpy(),
+            close.ewm(span=window, adjust=False).mean().to_numpy(),
+        )
+
+
+def test_state_in_an_older_layout_is_recomputed(incremental, df_raw):
+    _, state, _ = transform(incremental, df_raw.iloc[:-1], df_raw.iloc[:-1], None)
+    del state["version"]
+
+    _, _, was_incremental = transform(incremental, df_raw, df_raw.iloc[-1:], state)
+
+    assert not was_incremental
+
+
+def test_missing_transformed_file_is_rebuilt_in_full(
+    incremental, stock_frame, in_tmp_dir, monkeypatch
+):
+    df_all = stock_frame("AAPL", "2025-01-01", "2025-03-01")
+    monkeypatch.setattr(
+        incremental.yf,
+        "download",
+        lambda ticker, start, end, period: df_all[
+            (df_all.index >= start) & (df_all.index < end)
+        ],
+    )
+    path = in_tmp_dir / "data" / "AAPL_transformed_stock_data.csv"
+
+    incremental.fetch_and_save_stock_data(
+        start_date="2025-01-01", end_date="2025-02-01"
+    )
+    path.unlink()
+    incremental.fetch_and_save_stock_data(
+        start_date="2025-01-01", end_date="2025-03-01"
+    )
+
+    df = pd.read_csv(path, header=[0, 1], index_col=0, parse_dates=True)
+    assert len(df) == len(df_all)
+    # The flow's default indicators
+    expected, _, _ = incremental.transform_stock_data.fn(
+        df_all, df_all, None, [3], [12]
+    )
+    np.testing.assert_allclose(df.to_numpy(), expected.to_numpy(), equal_nan=True)
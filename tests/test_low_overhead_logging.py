@@ -0,0 +1,67 @@
+import logging
+import sys
+import pytest
+from prefect import task
+
+
+@pytest.fixture
+def low_overhead_logging(course_module):
+    return course_module("05_log_it/low_overhead_logging.py")
+
+
+@pytest.fixture
+def prefect_console(monkeypatch):
+    """A console handler on the prefect logger, as some logging configs attach it."""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    monkeypatch.setattr(logging.getLogger("prefect"), "handlers", [handler])
+    return handler, records
+
+
+def test_prefect_logger_is_queued_and_restored(low_overhead_logging, prefect_console):
+    handler, records = prefect_console
+    logger = logging.getLogger("prefect")
+
+    with low_overhead_logging.queued_logging():
+        (queued,) = logger.handlers
+        assert isinstance(queued, low_overhead_logging.DeferredQueueHandler)
+        logger.warning("queued %s", "message")
+
+    assert logger.handlers == [handler]
+    assert [record.getMessage() for record in records] == ["queued message"]
+
+
+def test_nested_use_does_not_queue_twice(low_overhead_logging, prefect_console):
+    logger = logging.getLogger("prefect")
+
+    with low_overhead_logging.queued_logging():
+        outer = list(logger.handlers)
+        with low_overhead_logging.queued_logging():
+            assert logger.handlers == outer
+        assert logger.handlers == outer
+
+
+def test_flow_queues_its_own_run_logs(
+    course_module, stock_frame, in_tmp_dir, monkeypatch
+):
+    flow_module = course_module("05_log_it/stock_data_log_summaries.py")
+    df = stock_frame("AAPL", "2025-02-01", "2025-02-28")
+    monkeypatch.setattr(flow_module.yf, "download", lambda *args, **kwargs: df)
+    handlers = {}
+
+    @task
+    def save_raw_stock_data(df, filename):
+        for name in ("prefect.task_runs", ""):
+            handlers[name] = logging.getLogger(name).handlers
+
+    monkeypatch.setattr(flow_module, "save_raw_stock_data", save_raw_stock_data)
+
+    # Called like a served or deployed run, without wrapping it
+    flow_module.fetch_and_save_stock_data()
+
+    # The flow imports its own copy of the helper module
+    queue_handler = sys.modules["low_overhead_logging"].DeferredQueueHandler
+    for name, queued in handlers.items():
+        assert queued, name
+        assert all(isinstance(handler, queue_handler) for handler in queued), name
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+
+
+class RaisingState:
+    def __init__(self, exc: Exception):
+        self.exc = exc
+
+    def result(self):
+        raise self.exc
+
+
+def status_error(status_code: int, headers: dict | None = None):
+    request = httpx.Request("GET", "https://api.example.com/quote")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.fixture
+def retry_policy(course_module):
+    return course_module("04_retries_for_resiliency/retry_policy.py")
+
+
+@pytest.mark.parametrize(
+    "exc, retried",
+    [
+        (status_error(429, {"Retry-After": "0"}), True),
+        (status_error(503), True),
+        (status_error(404), False),
+        (httpx.ConnectError("down", request=httpx.Request("GET", "https://a.b")), True),
+        (ConnectionError("reset"), True),
+        (TimeoutError(), True),
+        (KeyError("Close"), False),
+        (TypeError("bad argument"), False),
+    ],
+)
+def test_only_transient_errors_are_retried(retry_policy, exc, retried):
+    policy = retry_policy.RateLimitRetryPolicy(
+        retry_policy.HostBackoff(base_delay=0, max_delay=0)
+    )
+
+    assert policy(None, None, RaisingState(exc)) is retried
+
+
+def test_backoff_is_logged_not_printed(retry_policy, caplog, capsys):
+    backoff = retry_policy.HostBackoff(base_delay=0, max_delay=0)
+    policy = retry_policy.RateLimitRetryPolicy(backoff)
+
+    with caplog.at_level("WARNING"):
+        policy(None, None, RaisingState(status_error(429, {"Retry-After": "7"})))
+
+    assert "HTTP 429 from api.example.com, backing off 7.0s" in caplog.text
+    assert [record.name for record in caplog.records] == ["retry_policy"]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,66 @@
+import os
+import pytest
+from prefect import task
+
+
+@pytest.fixture
+def handoff(course_module, stock_frame, monkeypatch):
+    module = course_module("03_start_observing/stock_data_arrow_handoff.py")
+    df = stock_frame("AAPL", "2025-02-01", "2025-03-01")
+    monkeypatch.setattr(module.yf, "download", lambda *args, **kwargs: df.copy())
+    return module
+
+
+def handoff_files() -> list[str]:
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk("data/handoff")
+        for name in names
+    ]
+
+
+def test_completed_run_removes_its_handoff_files(handoff, in_tmp_dir):
+    state = handoff.fetch_and_save_stock_data(return_state=True)
+
+    assert state.is_completed()
+    assert os.path.exists("data/AAPL_transformed_stock_data.csv")
+    assert handoff_files() == []
+
+
+def test_flow_retry_reuses_the_handoff_files_of_cached_tasks(
+    handoff, in_tmp_dir, monkeypatch
+):
+    attempts = []
+    save_transformed = handoff.save_transformed_stock_data
+
+    @task(name=save_transformed.name)
+    def fail_once(df_ref, filename):
+        attempts.append(df_ref)
+        if len(attempts) == 1:
+            raise RuntimeError("Simulated failure of the first attempt")
+        save_transformed.fn(df_ref, filename)
+
+    monkeypatch.setattr(handoff, "save_transformed_stock_data", fail_once)
+    flow = handoff.fetch_and_save_stock_data.with_options(retries=1)
+
+    state = flow(return_state=True)
+
+    assert state.is_completed()
+    assert len(attempts) == 2
+    # The retry got the cached ref of the first attempt, and its file was still there
+    assert attempts[0] == attempts[1]
+    assert os.path.exists("data/AAPL_transformed_stock_data.csv")
+    assert handoff_files() == []
+
+
+def test_failed_run_keeps_its_handoff_files(handoff, in_tmp_dir, monkeypatch):
+    @task
+    def always_fail(df_ref, filename):
+        raise RuntimeError("Simulated failure")
+
+    monkeypatch.setattr(handoff, "save_transformed_stock_data", always_fail)
+
+    state = handoff.fetch_and_save_stock_data(return_state=True)
+
+    assert state.is_failed()
+    assert len(handoff_files()) == 2
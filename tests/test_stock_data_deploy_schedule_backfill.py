@@ -0,0 +1,108 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+import pytest
+from prefect.schedules import Cron, Interval
+from prefect.server.schemas.schedules import CronSchedule, IntervalSchedule
+
+NEW_YORK = "America/New_York"
+
+
+@pytest.fixture
+def backfill(course_module):
+    return course_module("06_schedule_workflows/stock_data_deploy_schedule_backfill.py")
+
+
+def server_slot_dates(schedule, start_date: str, end_date: str) -> list[date]:
+    """The days the Prefect server itself schedules, as the reference."""
+    tz = ZoneInfo(schedule.timezone)
+    start = datetime.fromisoformat(start_date).replace(tzinfo=tz)
+    end = datetime.fromisoformat(end_date).replace(tzinfo=tz) + timedelta(days=1)
+    if schedule.cron:
+        server_schedule = CronSchedule(
+            cron=schedule.cron, timezone=schedule.timezone, day_or=schedule.day_or
+        )
+    else:
+        server_schedule = IntervalSchedule(
+            interval=schedule.interval,
+            anchor_date=schedule.anchor_date,
+            timezone=schedule.timezone,
+        )
+    slots = asyncio.run(server_schedule.get_dates(n=100_000, start=start, end=end))
+    return sorted(
+        {slot.in_tz(schedule.timezone).date() for slot in slots if slot < end}
+    )
+
+
+@pytest.mark.parametrize(
+    "schedule",
+    [
+        Cron("1 1 1 1 1", timezone=NEW_YORK),
+        Cron("30 2 * * 1-5", timezone=NEW_YORK),
+        Cron("0 23 * * 0", timezone=NEW_YORK),
+        Interval(
+            timedelta(days=1), anchor_date=datetime(2025, 1, 1), timezone=NEW_YORK
+        ),
+        Interval(
+            timedelta(days=3), anchor_date=datetime(2024, 12, 30, 23), timezone=NEW_YORK
+        ),
+        Interval(
+            timedelta(hours=10), anchor_date=datetime(2025, 1, 1, 5), timezone=NEW_YORK
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        ("2024-12-28", "2025-01-09"),
+        ("2025-03-05", "2025-03-12"),
+        ("2025-11-01", "2025-11-03"),
+    ],
+)
+def test_slot_dates_match_the_server(backfill, schedule, start_date, end_date):
+    assert backfill.schedule_slot_dates(
+        [schedule], start_date, end_date
+    ) == server_slot_dates(schedule, start_date, end_date)
+
+
+def test_end_date_is_inclusive(backfill):
+    daily = Interval(
+        timedelta(days=1), anchor_date=datetime(2025, 1, 1), timezone=NEW_YORK
+    )
+
+    assert backfill.schedule_slot_dates([daily], "2025-02-03", "2025-02-05") == [
+        date(2025, 2, 3),
+        date(2025, 2, 4),
+        date(2025, 2, 5),
+    ]
+    assert backfill.schedule_slot_dates([daily], "2025-02-03", "2025-02-03") == [
+        date(2025, 2, 3)
+    ]
+
+
+def test_slot_dates_work_inside_a_running_event_loop(backfill):
+    async def from_async_code():
+        return backfill.schedule_slot_dates(
+            backfill.SCHEDULES, "2025-01-01", "2025-01-02"
+        )
+
+    assert asyncio.run(from_async_code()) == [date(2025, 1, 1), date(2025, 1, 2)]
+
+
+def test_backfill_fetches_once_and_writes_every_day_in_the_range(
+    backfill, stock_frame, in_tmp_dir, monkeypatch
+):
+    calls = []
+
+    def download(ticker, start, end, period):
+        calls.append((start, end))
+        df = stock_frame(ticker, "2025-01-01", "2025-03-01")
+        return df[(df.index >= start) & (df.index < end)]
+
+    monkeypatch.setattr(backfill.yf, "download", download)
+
+    backfill.backfill_stock_data("2025-02-03", "2025-02-05", window_days=7)
+
+    assert calls == [("2025-01-27", "2025-02-05")]
+    for day in ["2025-02-03", "2025-02-04", "2025-02-05"]:
+        assert (in_tmp_dir / "data" / f"SNOW_stock_data_{day}.csv").exists()
@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+HOLIDAYS = ["2024-12-25", "2025-01-01"]
+
+
+class FakeBatchDownload:
+    """yf.download for a batch: NOT-A-TICKER gets NaN columns, and chosen months fail once."""
+
+    def __init__(self, fail_once: set[str]):
+        self.fail_once = set(fail_once)
+        self.calls = []
+
+    def __call__(self, tickers, start, end, period):
+        self.calls.append((sorted(tickers), start, end))
+        if start in self.fail_once:
+            self.fail_once.discard(start)
+            raise Exception("Simulated intermittent API failure")
+        dates = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+        dates = dates.drop(dates.intersection(pd.DatetimeIndex(HOLIDAYS)))
+        columns = pd.MultiIndex.from_product(
+            [["Close", "Volume"], tickers], names=["Price", "Ticker"]
+        )
+        df = pd.DataFrame(1.0, index=dates.rename("Date"), columns=columns)
+        df.loc[:, df.columns.get_level_values(1) == "NOT-A-TICKER"] = np.nan
+        return df
+
+
+@pytest.fixture
+def partial(course_module, monkeypatch):
+    module = course_module("04_retries_for_resiliency/stock_data_retries_partial.py")
+    monkeypatch.setattr(
+        module,
+        "fetch_stock_data",
+        module.fetch_stock_data.with_options(retry_delay_seconds=0),
+    )
+    return module
+
+
+def checkpoint_files() -> list[str]:
+    return [name for _, _, names in os.walk("data/checkpoints") for name in names]
+
+
+def test_retry_requests_only_the_failed_month(partial, in_tmp_dir, monkeypatch):
+    download = FakeBatchDownload(fail_once={"2024-11-01"})
+    monkeypatch.setattr(partial, "flaky_download", download)
+
+    summary = partial.fetch_and_save_stock_data(
+        tickers=["AAPL", "MSFT"], start_date="2024-10-01", end_date="2024-12-01"
+    )
+
+    assert download.calls == [
+        (["AAPL", "MSFT"], "2024-10-01", "2024-11-01"),
+        (["AAPL", "MSFT"], "2024-11-01", "2024-12-01"),
+        (["AAPL", "MSFT"], "2024-11-01", "2024-12-01"),
+    ]
+    assert summary == {"succeeded": ["AAPL", "MSFT"], "partial": [], "failed": {}}
+    df = pd.read_csv("data/AAPL_stock_data.csv", header=[0, 1], index_col=0)
+    assert len(df) == len(pd.bdate_range("2024-10-01", "2024-11-30"))
+    assert checkpoint_files() == []
+
+
+def test_month_without_rows_is_done_and_unknown_ticker_is_not_retried(
+    partial, in_tmp_dir, monkeypatch
+):
+    download = FakeBatchDownload(fail_once=set())
+    monkeypatch.setattr(partial, "flaky_download", download)
+
+    summary = partial.fetch_and_save_stock_data(
+        tickers=["AAPL", "NOT-A-TICKER"],
+        start_date="2024-12-01",
+        end_date="2025-01-02",
+    )
+
+    # The second chunk is New Year's Day alone, so it has no rows to return
+    assert [call[1:] for call in download.calls] == [
+        ("2024-12-01", "2025-01-01"),
+        ("2025-01-01", "2025-01-02"),
+    ]
+    assert summary["succeeded"] == ["AAPL"]
+    assert summary["failed"] == {"NOT-A-TICKER": ["2024-12-01..2025-01-02: no data"]}
+    assert checkpoint_files() == []
+
+
+def test_last_attempt_keeps_what_succeeded(partial, in_tmp_dir, monkeypatch):
+    download = FakeBatchDownload(fail_once=set())
+    always_fail = {"2024-11-01"}
+
+    def flaky(tickers, start, end, period):
+        if start in always_fail:
+            download.calls.append((sorted(tickers), start, end))
+            raise Exception("Simulated outage")
+        return download(tickers, start, end, period)
+
+    monkeypatch.setattr(partial, "flaky_download", flaky)
+
+    summary = partial.fetch_and_save_stock_data(
+        tickers=["AAPL"], start_date="2024-10-01", end_date="2024-12-01"
+    )
+
+    # The first month is fetched once; the failing one on every attempt
+    assert [call[1] for call in download.calls] == ["2024-10-01"] + ["2024-11-01"] * 3
+    assert summary["partial"] == ["AAPL"]
+    assert list(summary["failed"]) == ["AAPL"]
+    assert os.path.exists("data/AAPL_stock_data.csv")
+    assert checkpoint_files() == []
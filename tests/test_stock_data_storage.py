@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def storage(course_module):
+    return course_module("03_start_observing/stock_data_storage.py")
+
+
+def test_half_implemented_backend_fails_when_instantiated(storage):
+    class WriteOnlyStorage(storage.StockDataStorage):
+        def write(self, df, dataset):
+            pass
+
+    with pytest.raises(TypeError, match="read"):
+        WriteOnlyStorage()
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_writes_merge_into_existing_partitions(
+    storage, stock_frame, tmp_path, file_format
+):
+    backend = storage.get_storage(file_format, str(tmp_path))
+    df = stock_frame("AAPL", "2025-01-01", "2025-03-01")
+
+    backend.write(df[df.index < "2025-02-01"], "raw")
+    backend.write(df[df.index >= "2025-02-01"], "raw")
+
+    df_read = backend.read("raw", tickers=["AAPL"])
+    pd.testing.assert_frame_equal(df_read, df, check_freq=False, check_dtype=False)
+    df_feb = backend.read("raw", start_date="2025-02-01", columns=["Close"])
+    assert len(df_feb) == len(df[df.index >= "2025-02-01"])
+    assert list(df_feb.columns) == [("Close", "AAPL")]
@@ -0,0 +1,69 @@
+import threading
+import time
+import tracemalloc
+import pytest
+
+
+@pytest.fixture
+def task_profiling(course_module, monkeypatch):
+    monkeypatch.setenv("PROFILE_TASKS", "1")
+    module = course_module("03_start_observing/task_profiling.py")
+    yield module
+    module._profiles.clear()
+
+
+def test_tracing_is_only_on_during_a_profiled_call(task_profiling):
+    tracing = []
+
+    @task_profiling.profiled
+    def allocate():
+        tracing.append(tracemalloc.is_tracing())
+        return bytearray(8 * 1024 * 1024)
+
+    allocate()
+
+    assert tracing == [True]
+    assert not tracemalloc.is_tracing()
+    (row,) = task_profiling._profiles[None]
+    assert row["peak_memory_mb"] >= 8
+
+
+def test_tracing_started_by_someone_else_is_left_on(task_profiling):
+    tracemalloc.start()
+    try:
+        task_profiling.profiled(lambda: None)()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_concurrent_calls_are_measured_one_at_a_time(task_profiling):
+    spans = {}
+
+    def make(name: str, megabytes: int):
+        def work():
+            start = time.perf_counter()
+            data = bytearray(megabytes * 1024 * 1024)
+            time.sleep(0.2)
+            spans[name] = (start, time.perf_counter())
+            return len(data)
+
+        work.__name__ = name
+        return task_profiling.profiled(work)
+
+    threads = [
+        threading.Thread(target=make("big", 32)),
+        threading.Thread(target=make("small", 1)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    first, second = sorted(spans.values())
+    assert first[1] <= second[0]
+    peaks = {
+        row["task"]: row["peak_memory_mb"] for row in task_profiling._profiles[None]
+    }
+    assert peaks["big"] >= 32
+    assert peaks["small"] < 8